@@ -12,20 +12,31 @@ Designed for kitchen staff (40-50 years old) - Large, clear, simple interface
 import tkinter as tk
 from tkinter import ttk, messagebox
 import cv2
-from PIL import Image, ImageTk
+import numpy as np
 from ultralytics import YOLO
 from datetime import datetime, time as dtime, timedelta
 import time
 import os
 import json
 import threading
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import paho.mqtt.client as mqtt
 
+try:
+    import orjson  # Optional: faster JSON parsing
+except ImportError:
+    orjson = None
+
 # =========================
 # Load Configuration
 # =========================
 def load_config(config_path="config.json"):
     """Load configuration from JSON file"""
+    if orjson is not None:
+        with open(config_path, 'rb') as f:
+            return orjson.loads(f.read())
     with open(config_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
@@ -41,12 +52,31 @@ DAY_START = dtime(sh, sm)
 DAY_END = dtime(eh, em)
 
 MODEL_PATH = config['yolo_model']
+YOLO_HALF = config.get('yolo_half', True)  # FP16 inference (TensorRT engine on Jetson)
+YOLO_DEVICE = config.get('yolo_device', 0)
+YOLO_EXPORT_ENGINE = config.get('yolo_export_engine', True)  # Build .engine from .pt once
+YOLO_PRECISION = config.get('yolo_precision', 'fp16' if YOLO_HALF else 'fp32')  # fp32/fp16/int8
+YOLO_DLA_CORE = config.get('yolo_dla_core')  # None = GPU, 0/1 = DLA core (GPU fallback)
+YOLO_CALIB_DATA = config.get('yolo_calib_data', 'coco8.yaml')  # INT8 calibration dataset ('snapshots' = own frames)
+YOLO_CALIB_FRAMES = config.get('yolo_calib_frames', 200)  # Max snapshot frames used for INT8 calibration
+YOLO_WORKSPACE = config.get('yolo_workspace', 4)  # TensorRT builder workspace (GiB)
+YOLO_ROUND_ROBIN = config.get('yolo_round_robin', False)  # Alternate frames between DLA and GPU engines
+YOLO_INFER_INTERVAL = config.get('yolo_infer_interval', 0)  # Day mode: YOLO every N frames (0 = adaptive)
 CAMERA_INDEX = config['camera_index']
 YOLO_CONF = config['yolo_confidence']
 DETECTION_HOLD_SEC = config['detection_hold_sec']
 NIGHT_CHECK_MINUTES = config['night_check_minutes']
 MOTION_MIN_AREA = config['motion_min_area']
 SNAPSHOT_DIR = config['snapshot_dir']
+USE_CUDA = config.get('use_cuda', True)  # OpenCV CUDA modules (MOG2) when available
+MOG2_HISTORY = config.get('mog2_history', 120)  # Background adaptation time constant (frames)
+MOG2_UPDATE_EVERY_N = max(1, config.get('mog2_update_every_n', 1))  # Background model update interval
+CPU_THREADS = config.get('cpu_threads', 2)  # OpenCV/PyTorch CPU threads (leave cores for Tk and capture)
+NIGHT_DIFF_THRESH = config.get('night_diff_thresh', 2.0)  # Night check: mean 96x96 gray diff that triggers YOLO
+CAMERA_BACKEND = config.get('camera_backend', 'v4l2')  # 'usb_mjpeg', 'csi', 'gstreamer' (raw USB) or 'v4l2'
+CAMERA_WIDTH = config.get('camera_width', 1280)
+CAMERA_HEIGHT = config.get('camera_height', 720)
+CAMERA_FPS = config.get('camera_fps', 30)
 SAVE_COOLDOWN_SEC = config['snapshot_cooldown_sec']
 
 # MQTT Configuration
@@ -56,6 +86,7 @@ MQTT_PORT = config.get('mqtt_port', 1883)
 MQTT_TOPIC = config.get('mqtt_topic', 'robot/control')
 MQTT_QOS = config.get('mqtt_qos', 1)
 MQTT_CLIENT_ID = config.get('mqtt_client_id', 'robotcam_jetson')
+MQTT_STATUS_TOPIC = config.get('mqtt_status_topic', '')  # 1 Hz QoS 0 status beat (empty = off)
 
 # Stir-fry monitoring configuration
 STIRFRY_CAMERA_INDEX = config.get('stirfry_camera_index', 2)  # Different camera
@@ -63,14 +94,20 @@ STIRFRY_SAVE_DIR = config.get('stirfry_save_dir', 'StirFry_Data')
 
 # Fixed parameters
 YOLO_IMGSZ = 416  # Reduced from 640 for better performance
-MOG2_HISTORY = 500
 MOG2_VARTHRESH = 16
 BINARY_THRESH = 200
 WARMUP_FRAMES = 30
+MAX_DET = 64  # Preallocated detection slots per frame
+DIFF_SIZE = (96, 96)  # Night check difference detector resolution
+FRAME_BUDGET_SEC = 0.020  # Target GUI loop period (~50 FPS)
+NIGHT_YOLO_MAX_GAP_SEC = 1.0  # Night check: run YOLO at least this often even on a static scene
+PERSON_CLASS_ID = 0  # COCO "person" (fallback when the model has no 'person' name)
 
 # GUI Configuration
 WINDOW_WIDTH = 1400
 WINDOW_HEIGHT = 900
+PREVIEW_SIZE = (560, 420)  # Camera preview (width, height)
+SNAPSHOT_PREVIEW_SIZE = (320, 240)  # Developer panel snapshot thumbnail
 LARGE_FONT = ("NanumGothic", 24, "bold")
 MEDIUM_FONT = ("NanumGothic", 18)
 NORMAL_FONT = ("NanumGothic", 14)
@@ -85,6 +122,384 @@ COLOR_BG = "#263238"      # Dark gray
 COLOR_PANEL = "#37474F"   # Medium gray
 COLOR_TEXT = "#FFFFFF"    # White
 
+
+
+def cuda_available():
+    """True if OpenCV was built with CUDA and a CUDA device is present"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+def gstreamer_pipeline(index, backend):
+    """Jetson camera pipeline keeping frames in NVMM until the final BGR conversion"""
+    size = f"width={CAMERA_WIDTH},height={CAMERA_HEIGHT},framerate={CAMERA_FPS}/1"
+    if backend == 'csi':
+        # CSI sensor through the ISP (debayer/colour on dedicated hardware)
+        source = f"nvarguscamerasrc sensor-id={index} ! video/x-raw(memory:NVMM),{size} ! nvvidconv"
+    elif backend == 'usb_mjpeg':
+        # USB UVC camera sending MJPEG, decoded on NVJPG
+        source = (f"v4l2src device=/dev/video{index} ! image/jpeg,{size} ! "
+                  "nvv4l2decoder mjpeg=1 ! nvvidconv")
+    else:
+        # USB UVC camera sending raw frames, converted on the VIC
+        source = (f"v4l2src device=/dev/video{index} ! video/x-raw,{size} ! "
+                  "nvvidconv ! video/x-raw(memory:NVMM),format=NV12 ! nvvidconv")
+    return (
+        f"{source} ! video/x-raw,format=BGRx ! "
+        "videoconvert ! video/x-raw,format=BGR ! "
+        "appsink drop=1 max-buffers=1"
+    )
+
+
+def open_camera(index):
+    """Open a camera through GStreamer when configured, falling back to V4L2"""
+    if CAMERA_BACKEND != 'v4l2':
+        cap = cv2.VideoCapture(gstreamer_pipeline(index, CAMERA_BACKEND), cv2.CAP_GSTREAMER)
+        if cap.isOpened():
+            return cap
+        cap.release()
+        print(f"[카메라] GStreamer 파이프라인 실패 ({CAMERA_BACKEND}), V4L2로 전환: /dev/video{index}")
+
+    cap = cv2.VideoCapture(index, cv2.CAP_V4L2)
+    # Compressed MJPG instead of raw YUYV, fixed size/rate, and no stale frame backlog
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+    cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+def filter_motion(mask, min_area, scale=1.0):
+    """Return (x, y, w, h, area) rows of mask blobs of at least min_area full-frame pixels"""
+    # One native labeling pass; stats rows are (x, y, w, h, area), row 0 is background
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    stats = stats[1:]
+    blobs = stats[stats[:, cv2.CC_STAT_AREA] >= min_area / (scale * scale)].astype(np.float32)
+    # Back to full-frame coordinates and areas
+    blobs[:, :4] *= scale
+    blobs[:, 4] *= scale * scale
+    return np.rint(blobs).astype(np.int32)
+
+
+def create_tracker():
+    """KCF tracker for holding person boxes between YOLO runs (None without opencv-contrib)"""
+    try:
+        return cv2.legacy.TrackerKCF_create()
+    except AttributeError:
+        return None
+
+
+def engine_path_for(model_path, dla_core):
+    """TensorRT engine file name for the configured precision / DLA core"""
+    stem = os.path.splitext(model_path)[0]
+    if YOLO_PRECISION == 'fp16' and dla_core is None:
+        return stem + '.engine'
+    suffix = f"_{YOLO_PRECISION}" + (f"_dla{dla_core}" if dla_core is not None else "")
+    return stem + suffix + '.engine'
+
+
+def calibration_data(model):
+    """Return the INT8 calibration dataset, building one from motion snapshots if configured"""
+    if YOLO_CALIB_DATA != 'snapshots':
+        return YOLO_CALIB_DATA
+
+    images = []
+    if os.path.isdir(SNAPSHOT_DIR):
+        for day_dir in sorted(os.listdir(SNAPSHOT_DIR), reverse=True):
+            day_path = os.path.join(SNAPSHOT_DIR, day_dir)
+            if os.path.isdir(day_path):
+                images.extend(os.path.abspath(os.path.join(day_path, f))
+                              for f in sorted(os.listdir(day_path)) if f.endswith('.jpg'))
+    if len(images) < 50:
+        print(f"[YOLO] 캘리브레이션용 스냅샷 부족 ({len(images)}장), coco8.yaml 사용")
+        return 'coco8.yaml'
+
+    # Spread the sample over the newest days
+    step = max(1, len(images) // YOLO_CALIB_FRAMES)
+    images = images[::step][:YOLO_CALIB_FRAMES]
+    list_path = os.path.abspath('calib_images.txt')
+    with open(list_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(images) + "\n")
+
+    import yaml  # Installed with ultralytics
+    yaml_path = os.path.abspath('calib.yaml')
+    with open(yaml_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump({'train': list_path, 'val': list_path, 'names': dict(model.names)}, f)
+    print(f"[YOLO] 스냅샷 {len(images)}장으로 INT8 캘리브레이션: {yaml_path}")
+    return yaml_path
+
+
+def export_engine(model_path, dla_core):
+    """Export a .pt model to a TensorRT engine and return its path"""
+    engine_path = engine_path_for(model_path, dla_core)
+    if os.path.exists(engine_path):
+        return engine_path
+
+    target = f"DLA {dla_core}" if dla_core is not None else "GPU"
+    print(f"[YOLO] TensorRT {YOLO_PRECISION.upper()} 엔진 생성 중 ({target}, 최초 1회, 수 분 소요): {engine_path}")
+    model = YOLO(model_path)
+    export_args = dict(format='engine', imgsz=YOLO_IMGSZ, workspace=YOLO_WORKSPACE,
+                       half=(YOLO_PRECISION == 'fp16'), int8=(YOLO_PRECISION == 'int8'),
+                       device=f"dla:{dla_core}" if dla_core is not None else YOLO_DEVICE)
+    if YOLO_PRECISION == 'int8':
+        export_args['data'] = calibration_data(model)
+    exported = model.export(**export_args)
+    if os.path.abspath(exported) != os.path.abspath(engine_path):
+        os.replace(exported, engine_path)
+    return engine_path
+
+
+def resolve_model_path(model_path):
+    """Return TensorRT engine path for a .pt model (built once), fall back to .pt"""
+    if not YOLO_EXPORT_ENGINE or not model_path.endswith('.pt'):
+        return model_path
+
+    try:
+        return export_engine(model_path, YOLO_DLA_CORE)
+    except Exception as e:
+        print(f"[YOLO] TensorRT 변환 실패: {e}")
+
+    if YOLO_DLA_CORE is not None:
+        try:
+            return export_engine(model_path, None)
+        except Exception as e:
+            print(f"[YOLO] GPU 엔진 변환 실패: {e}")
+
+    print("[YOLO] PyTorch 모델 사용")
+    return model_path
+
+
+class DetectionBuffer:
+    """Preallocated per-frame YOLO detections (structure of arrays)"""
+
+    def __init__(self, max_det=MAX_DET):
+        self.xyxy = np.zeros((max_det, 4), dtype=np.float32)
+        self.conf = np.zeros(max_det, dtype=np.float32)
+        self.cls = np.zeros(max_det, dtype=np.int32)
+        self.count = 0
+
+    def load(self, boxes, cls_id=None):
+        """Copy YOLO boxes (optionally one class) into the preallocated slots, return detection count"""
+        data = None if boxes is None else boxes.data  # x1, y1, x2, y2, conf, cls
+        if data is not None and cls_id is not None:
+            data = data[data[:, 5] == cls_id]  # Filter on the device, before the copy
+        n = 0 if data is None else min(len(data), len(self.conf))
+        if n > 0:
+            data = data[:n].cpu().numpy()  # Single device-to-host transfer
+            np.copyto(self.xyxy[:n], data[:, :4])
+            np.copyto(self.conf[:n], data[:, 4])
+            np.copyto(self.cls[:n], data[:, 5], casting='unsafe')
+        self.count = n
+        return n
+
+    def boxes_of(self, cls_id):
+        """Return xyxy rows of the given class"""
+        n = self.count
+        return self.xyxy[:n][self.cls[:n] == cls_id]
+
+
+class YoloEngine:
+    """A loaded YOLO model with its own inference thread and detection buffer"""
+
+    def __init__(self, model_path, name):
+        self.name = name
+        self.model = YOLO(model_path, task='detect')
+        if model_path.endswith('.pt'):
+            self.model.fuse()  # PyTorch fallback: fold Conv+BN once instead of per call
+        # Look the class up by name so custom-trained models with other label orders still work
+        names = self.model.names or {}
+        self.person_cls = next((k for k, v in names.items() if v == 'person'), PERSON_CLASS_ID)
+        self.detections = DetectionBuffer()
+        # One worker per engine; the Tk loop polls the future without blocking
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"yolo-{name}")
+        self.future = None
+        self.ewma = 0.0  # Smoothed inference time (seconds)
+        self.warmup()
+
+    def warmup(self):
+        """Run one dummy inference so engine setup doesn't land on the first camera frame"""
+        dummy = np.zeros((YOLO_IMGSZ, YOLO_IMGSZ, 3), dtype=np.uint8)
+        self.model.predict(dummy, conf=YOLO_CONF, imgsz=YOLO_IMGSZ,
+                           half=YOLO_HALF, device=YOLO_DEVICE, verbose=False)
+
+    def submit(self, small):
+        """Start inference on a copy of the frame"""
+        self.future = self.pool.submit(self.detect_persons, small.copy())
+
+    def detect_persons(self, small):
+        """Worker: run YOLO and return (person boxes, frame) in detection-frame coordinates"""
+        t0 = time.monotonic()
+        # Only the cheap letterbox pad is left to Ultralytics
+        r = self.model.predict(small, conf=YOLO_CONF, imgsz=YOLO_IMGSZ,
+                               half=YOLO_HALF, device=YOLO_DEVICE, verbose=False)[0]
+        dt = time.monotonic() - t0
+        self.ewma = dt if self.ewma == 0.0 else 0.9 * self.ewma + 0.1 * dt
+        n = self.detections.load(r.boxes, self.person_cls)
+        return self.detections.xyxy[:n].astype(np.int32), small
+
+    def shutdown(self):
+        """Wait for the running inference and stop the worker"""
+        self.pool.shutdown(wait=True)
+
+
+class CaptureThread:
+    """Background camera reader keeping only the latest frame (buffers reused from a free list)"""
+
+    def __init__(self, name, pinned=False):
+        self.name = name
+        self.pinned = pinned  # Page-lock buffers so GPU uploads are DMA transfers
+        self.latest = queue.Queue(maxsize=1)
+        self.free = queue.Queue()
+        self.current = None  # Frame currently held by the GUI loop
+        self.registered = []
+        self.cap = None
+        self.running = False
+        self.thread = None
+
+    def start(self, cap):
+        """Start reading frames from an opened capture"""
+        self.cap = cap
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name=f"{self.name}-capture", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while self.running:
+            try:
+                buf = self.free.get_nowait()
+            except queue.Empty:
+                buf = None  # Let OpenCV allocate a new buffer
+            ok, frame = self.cap.read(buf) if buf is not None else self.cap.read()
+            if not ok or frame is None:
+                if buf is not None:
+                    self.free.put(buf)
+                time.sleep(0.05)
+                continue
+            if frame is not buf and self.pinned:
+                cv2.cuda.registerPageLocked(frame)
+                self.registered.append(frame)
+
+            # Replace a frame the GUI loop has not picked up yet
+            try:
+                self.free.put(self.latest.get_nowait())
+            except queue.Empty:
+                pass
+            self.latest.put(frame)
+
+    def read(self):
+        """Return (True, frame) for a new frame, (False, None) if none arrived since the last call"""
+        try:
+            frame = self.latest.get_nowait()
+        except queue.Empty:
+            return False, None
+        if self.current is not None:
+            self.free.put(self.current)
+        self.current = frame
+        return True, frame
+
+    def stop(self):
+        """Stop the reader thread and unregister page-locked buffers"""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+        for buf in self.registered:
+            cv2.cuda.unregisterPageLocked(buf)
+        self.registered = []
+
+
+class PreviewSurface:
+    """Persistent Tk preview image fed as PPM data (no PIL round trip)"""
+
+    def __init__(self, label, size=PREVIEW_SIZE):
+        self.label = label
+        self.size = size
+        w, h = size
+        header = f"P6 {w} {h} 255\n".encode('ascii')
+        # PPM header followed by the RGB pixels; cvtColor writes straight into it
+        self.ppm = bytearray(header) + bytearray(w * h * 3)
+        self.rgb = np.frombuffer(self.ppm, dtype=np.uint8, offset=len(header)).reshape(h, w, 3)
+        self.bgr = np.empty((h, w, 3), dtype=np.uint8)
+        self.photo = tk.PhotoImage(width=w, height=h)
+
+    def show(self, frame):
+        """Resize and convert into the reused buffers, then load them into the PhotoImage"""
+        try:
+            cv2.resize(frame, self.size, dst=self.bgr)
+            cv2.cvtColor(self.bgr, cv2.COLOR_BGR2RGB, dst=self.rgb)
+            self.photo.configure(data=bytes(self.ppm), format='PPM')
+            if getattr(self.label, 'imgtk', None) is not self.photo:
+                self.label.imgtk = self.photo
+                self.label.configure(image=self.photo, text="")
+        except Exception:
+            pass
+
+
+class AsyncImageWriter:
+    """Background JPEG writer fed through a bounded queue"""
+
+    def __init__(self, name, maxsize=16, quality=85):
+        self.name = name
+        self.params = [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self.known_dirs = set()  # Directories already created (one makedirs per day folder)
+        self.thread = threading.Thread(target=self._run, name=f"{name}-writer", daemon=True)
+        self.thread.start()
+
+    def put(self, frame, path):
+        """Queue a copy of the frame for writing, return False if dropped"""
+        try:
+            self.queue.put_nowait((frame.copy(), path))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 100 == 1:  # Don't flood the log while recording
+                print(f"[경고] {self.name} 저장 대기열 가득 참, 프레임 버림 (누적 {self.dropped}장): {path}")
+            return False
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            frame, path = item
+            try:
+                out_dir = os.path.dirname(path)
+                if out_dir not in self.known_dirs:
+                    os.makedirs(out_dir, exist_ok=True)
+                    self.known_dirs.add(out_dir)
+                ok, buf = cv2.imencode('.jpg', frame, self.params)
+                if not ok:
+                    print(f"[오류] {self.name} 인코딩 실패: {path}")
+                    continue
+                self._write_file(path, buf)
+            except Exception as e:
+                print(f"[오류] {self.name} 저장 실패: {e}")
+
+    @staticmethod
+    def _write_file(path, buf):
+        """Write the encoded buffer with raw os.write calls (no Python file object or bytes copy)"""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(buf).cast('B')
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+    def close(self, timeout=5.0):
+        """Flush queued frames and stop the writer thread"""
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+
+# Keep OpenCV from spreading small per-frame ops over every core (Tk, capture and YOLO threads need them)
+cv2.setNumThreads(CPU_THREADS)
+cv2.ocl.setUseOpenCL(False)
+
 print("[초기화] Jetson #1 통합 시스템 시작 중...")
 print(f"[설정] 자동 ON/OFF: {FORCE_MODE or '자동'} | {DAY_START.strftime('%H:%M')}~{DAY_END.strftime('%H:%M')}")
 print(f"[설정] 카메라 1 (자동): {CAMERA_INDEX} | 카메라 2 (볶음): {STIRFRY_CAMERA_INDEX}")
@@ -111,7 +526,13 @@ class IntegratedMonitorApp:
         # Variables
         self.running = True
         self.mqtt_client = None
-        self.yolo_model = None
+        self.mqtt_queue = queue.Queue(maxsize=64)  # (topic, payload, qos) for the publisher thread
+        self.mqtt_thread = None
+        self.status_persons = 0  # Latest person count for the status beat
+        self.status_motion = 0  # Latest motion blob count for the status beat
+        self.yolo_engines = []  # DLA and/or GPU engines, used round-robin
+        self.yolo_pending = deque()  # Engines with a running inference, in submission order
+        self.yolo_next = 0
         self.auto_cap = None
         self.stirfry_cap = None
         self.stirfry_recording = False
@@ -128,19 +549,48 @@ class IntegratedMonitorApp:
         self.night_no_person_deadline = None
         self.off_triggered_once = False
         self.prev_daytime = None
+        self.cached_daytime = False
+        self.mode_valid_until = 0.0  # Monotonic time of the next day/night re-check
         self.last_snapshot_tick = None
         self.frame_idx = 0
         self.yolo_frame_skip = 0  # Frame skip counter for performance
+        self.night_ref_gray = None  # 96x96 gray of the last frame sent to YOLO in the night check
+        self.night_yolo_tick = 0.0
+        self.person_trackers = []  # KCF trackers started from the last YOLO persons
+        self.tracked_persons = np.zeros((0, 4), dtype=np.int32)
 
-        # Background subtractor
+        # Background subtractor (CUDA on Jetson, CPU otherwise)
+        # Shadows (127) never pass BINARY_THRESH, so shadow detection is disabled
         self.kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-        self.bg = cv2.createBackgroundSubtractorMOG2(
-            history=MOG2_HISTORY, varThreshold=MOG2_VARTHRESH, detectShadows=True
-        )
+        self.use_cuda = USE_CUDA and cuda_available()
+        if self.use_cuda:
+            self.bg = cv2.cuda.createBackgroundSubtractorMOG2(
+                history=MOG2_HISTORY, varThreshold=MOG2_VARTHRESH, detectShadows=False
+            )
+            self.gpu_open = cv2.cuda.createMorphologyFilter(cv2.MORPH_OPEN, cv2.CV_8UC1, self.kernel)
+            self.gpu_frame = cv2.cuda_GpuMat()  # Reused full-frame upload buffer
+            self.gpu_small = cv2.cuda_GpuMat()  # Reused resize output
+            self.gpu_detect = self.gpu_small  # Detection-sized frame on the GPU, kept for MOG2
+            self.cuda_stream = cv2.cuda_Stream()
+            print("[모션] CUDA 배경차분 사용")
+        else:
+            self.bg = cv2.createBackgroundSubtractorMOG2(
+                history=MOG2_HISTORY, varThreshold=MOG2_VARTHRESH, detectShadows=False
+            )
+
+        # Capture threads (auto camera buffers page-locked for GPU uploads)
+        self.auto_capture = CaptureThread("auto", pinned=self.use_cuda)
+        self.stirfry_capture = CaptureThread("stirfry")
+        self.snapshot_writer = AsyncImageWriter("스냅샷", quality=90)  # Evidence frames, higher quality
+        self.stirfry_writer = AsyncImageWriter("볶음", maxsize=64)
 
         # Initialize GUI
         self.create_gui()
 
+        # Persistent preview images, updated in place every frame
+        self.auto_preview = PreviewSurface(self.auto_preview_label)
+        self.stirfry_preview = PreviewSurface(self.stirfry_preview_label)
+
         # Initialize systems
         self.init_mqtt()
         self.init_cameras()
@@ -150,6 +600,7 @@ class IntegratedMonitorApp:
         self.update_clock()
         self.update_auto_system()
         self.update_stirfry_camera()
+        self.publish_status()
 
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -170,11 +621,14 @@ class IntegratedMonitorApp:
         clock_frame = tk.Frame(header_frame, bg=COLOR_BG)
         clock_frame.pack(side=tk.RIGHT, padx=20)
 
-        self.time_label = tk.Label(clock_frame, text="--:--:--",
+        self.time_var = tk.StringVar(value="--:--:--")
+        self.date_var = tk.StringVar(value="----/--/--")
+
+        self.time_label = tk.Label(clock_frame, textvariable=self.time_var,
                                    font=("NanumGothic", 28, "bold"), bg=COLOR_BG, fg=COLOR_INFO)
         self.time_label.pack()
 
-        self.date_label = tk.Label(clock_frame, text="----/--/--",
+        self.date_label = tk.Label(clock_frame, textvariable=self.date_var,
                                    font=MEDIUM_FONT, bg=COLOR_BG, fg=COLOR_TEXT)
         self.date_label.pack()
 
@@ -311,6 +765,7 @@ class IntegratedMonitorApp:
                                             bg="black", fg="white", font=NORMAL_FONT,
                                             width=50, height=15)
         self.dev_snapshot_preview.pack(pady=10, padx=10)
+        self.dev_snapshot_surface = PreviewSurface(self.dev_snapshot_preview, SNAPSHOT_PREVIEW_SIZE)
 
         # Motion detection info
         self.dev_motion_label = tk.Label(panel, text="모션 감지: 대기 중",
@@ -346,7 +801,7 @@ class IntegratedMonitorApp:
         self.night_check_active = False
         self.night_no_person_deadline = None
         self.off_triggered_once = True
-        self.auto_detection_label.config(text="감지: 테스트 모드 (스냅샷)", fg=COLOR_WARNING)
+        self.set_label(self.auto_detection_label, "감지: 테스트 모드 (스냅샷)", COLOR_WARNING)
         messagebox.showinfo("테스트 모드", "스냅샷 모드가 즉시 시작되었습니다.\n모션 감지 시 자동 저장됩니다.")
 
     # =========================
@@ -381,6 +836,10 @@ class IntegratedMonitorApp:
             self.mqtt_client.connect(MQTT_BROKER, MQTT_PORT, keepalive=60)
             self.mqtt_client.loop_start()
 
+            # Publishes go through a queue so the Tk loop never waits on the network
+            self.mqtt_thread = threading.Thread(target=self.mqtt_publisher_loop, name="mqtt-publisher", daemon=True)
+            self.mqtt_thread.start()
+
         except Exception as e:
             print(f"[MQTT] 초기화 실패: {e}")
             self.auto_mqtt_label.config(text=f"MQTT: 오류", fg=COLOR_ERROR)
@@ -389,9 +848,10 @@ class IntegratedMonitorApp:
         """Initialize both cameras"""
         # Camera 1: Auto-start/down system
         try:
-            self.auto_cap = cv2.VideoCapture(CAMERA_INDEX)
+            self.auto_cap = open_camera(CAMERA_INDEX)
             if self.auto_cap.isOpened():
                 print(f"[카메라] 자동 ON/OFF 카메라 {CAMERA_INDEX} 열림")
+                self.auto_capture.start(self.auto_cap)
             else:
                 print(f"[오류] 자동 ON/OFF 카메라 {CAMERA_INDEX} 열기 실패")
         except Exception as e:
@@ -399,9 +859,10 @@ class IntegratedMonitorApp:
 
         # Camera 2: Stir-fry monitoring
         try:
-            self.stirfry_cap = cv2.VideoCapture(STIRFRY_CAMERA_INDEX)
+            self.stirfry_cap = open_camera(STIRFRY_CAMERA_INDEX)
             if self.stirfry_cap.isOpened():
                 print(f"[카메라] 볶음 모니터링 카메라 {STIRFRY_CAMERA_INDEX} 열림")
+                self.stirfry_capture.start(self.stirfry_cap)
             else:
                 print(f"[오류] 볶음 모니터링 카메라 {STIRFRY_CAMERA_INDEX} 열기 실패")
         except Exception as e:
@@ -410,8 +871,26 @@ class IntegratedMonitorApp:
     def init_yolo(self):
         """Initialize YOLO model"""
         try:
-            print(f"[YOLO] 모델 로딩 중: {MODEL_PATH}")
-            self.yolo_model = YOLO(MODEL_PATH)
+            import torch  # Installed with ultralytics
+            torch.set_num_threads(CPU_THREADS)
+            torch.set_num_interop_threads(1)
+        except (ImportError, RuntimeError) as e:
+            print(f"[YOLO] PyTorch 스레드 설정 실패: {e}")
+
+        try:
+            model_path = resolve_model_path(MODEL_PATH)
+            on_dla = YOLO_DLA_CORE is not None and model_path == engine_path_for(MODEL_PATH, YOLO_DLA_CORE)
+            print(f"[YOLO] 모델 로딩 중: {model_path}")
+            self.yolo_engines.append(YoloEngine(model_path, "dla" if on_dla else "gpu"))
+
+            # Second engine on the GPU so consecutive frames alternate DLA / GPU
+            if YOLO_ROUND_ROBIN and on_dla:
+                try:
+                    gpu_path = export_engine(MODEL_PATH, None)
+                    self.yolo_engines.append(YoloEngine(gpu_path, "gpu"))
+                    print("[YOLO] DLA + GPU 엔진 교대 추론")
+                except Exception as e:
+                    print(f"[YOLO] GPU 엔진 추가 실패, DLA만 사용: {e}")
             print("[YOLO] 모델 로드 완료")
         except Exception as e:
             print(f"[오류] YOLO 초기화 실패: {e}")
@@ -426,23 +905,26 @@ class IntegratedMonitorApp:
             return
 
         now = datetime.now()
-        self.time_label.config(text=now.strftime("%H:%M:%S"))
-        self.date_label.config(text=now.strftime("%Y년 %m월 %d일"))
+        self.time_var.set(now.strftime("%H:%M:%S"))
+        date_text = now.strftime("%Y년 %m월 %d일")
+        if date_text != self.date_var.get():
+            self.date_var.set(date_text)
 
-        self.root.after(1000, self.update_clock)
+        # Fire just after the next wall-clock second so the display never skips a second
+        self.root.after(1000 - now.microsecond // 1000 + 5, self.update_clock)
 
     def update_auto_system(self):
         """Update auto-start/down system (YOLO + MQTT)"""
         if not self.running:
             return
 
-        if self.auto_cap is None or not self.auto_cap.isOpened() or self.yolo_model is None:
+        if self.auto_cap is None or not self.auto_cap.isOpened() or not self.yolo_engines:
             self.root.after(100, self.update_auto_system)
             return
 
-        ok, frame = self.auto_cap.read()
-        if not ok or frame is None:
-            self.root.after(100, self.update_auto_system)
+        ok, frame = self.auto_capture.read()
+        if not ok:
+            self.root.after(10, self.update_auto_system)  # No new frame yet
             return
 
         now = datetime.now()
@@ -475,6 +957,7 @@ class IntegratedMonitorApp:
         if (self.prev_daytime is False) and (daytime is True):
             self.on_triggered = False
             self.det_hold_start = None
+            self.status_motion = 0
             self.night_check_active = False
             self.night_no_person_deadline = None
             self.off_triggered_once = False
@@ -483,54 +966,50 @@ class IntegratedMonitorApp:
 
         self.prev_daytime = daytime
 
+        # Downscale once; MOG2 and YOLO both work on the detection-sized frame
+        small, scale = self.downscale(frame)
+
         # Process based on mode
         if daytime:
-            self.process_day_mode(frame, now)
+            self.process_day_mode(frame, small, scale, now)
         else:
-            self.process_night_mode(frame, now)
+            self.process_night_mode(frame, small, scale, now)
 
         # Update preview
         self.update_auto_preview(frame)
 
         self.root.after(20, self.update_auto_system)  # ~50 FPS for smoother display
 
-    def process_day_mode(self, frame, now):
+    def process_day_mode(self, frame, small, scale, now):
         """Process day mode: YOLO person detection"""
-        # Skip frames for performance - process YOLO every 3 frames
+        # Submit YOLO every N frames, track the last person boxes in between
+        done = self.collect_yolo()
         self.yolo_frame_skip += 1
-        if self.yolo_frame_skip < 3:
-            return  # Skip this frame, use previous detection result
-
-        self.yolo_frame_skip = 0  # Reset counter
-
-        # Run YOLO detection
-        results = self.yolo_model.predict(frame, conf=YOLO_CONF, imgsz=YOLO_IMGSZ, verbose=False)
-        r = results[0]
-
-        detected = False
-        person_count = 0
-
-        # Draw bounding boxes on detected people
-        if r.boxes is not None and r.boxes.cls is not None and len(r.boxes.cls) > 0:
-            for i, cls in enumerate(r.boxes.cls):
-                if r.names.get(int(cls), "") == "person":
-                    detected = True
-                    person_count += 1
-                    # Draw green box around person
-                    box = r.boxes.xyxy[i].cpu().numpy().astype(int)
-                    cv2.rectangle(frame, (box[0], box[1]), (box[2], box[3]), (0, 255, 0), 3)
-                    # Add label
-                    cv2.putText(frame, "Person", (box[0], box[1]-10),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        if self.yolo_frame_skip >= self.yolo_interval() and self.submit_yolo(small):
+            self.yolo_frame_skip = 0  # Reset counter
+
+        if done is None:
+            self.draw_persons(frame, self.track_persons(small), scale)
+            return  # Use previous detection result
+
+        # Fresh YOLO result (from the frame it was submitted with)
+        persons, src = done
+        person_count = len(persons)
+        self.status_persons = person_count
+        detected = person_count > 0
+        self.start_person_trackers(src, persons)
+
+        # Draw bounding boxes on detected people, moved forward to this frame
+        self.draw_persons(frame, self.track_persons(small), scale)
 
         if detected:
             if self.det_hold_start is None:
                 self.det_hold_start = now
-                self.auto_detection_label.config(text=f"감지: 사람 {person_count}명", fg=COLOR_WARNING)
+                self.set_label(self.auto_detection_label, f"감지: 사람 {person_count}명", COLOR_WARNING)
             else:
                 hold_sec = (now - self.det_hold_start).total_seconds()
                 remaining = int(DETECTION_HOLD_SEC - hold_sec)
-                self.auto_detection_label.config(text=f"감지: {person_count}명 ({remaining}초)", fg=COLOR_WARNING)
+                self.set_label(self.auto_detection_label, f"감지: {person_count}명 ({remaining}초)", COLOR_WARNING)
 
                 if hold_sec >= DETECTION_HOLD_SEC and not self.on_triggered:
                     print("=" * 50)
@@ -538,13 +1017,60 @@ class IntegratedMonitorApp:
                     print("=" * 50)
                     self.publish_mqtt("ON")
                     self.on_triggered = True
-                    self.auto_detection_label.config(text="감지: ON 전송 완료", fg=COLOR_OK)
+                    self.set_label(self.auto_detection_label, "감지: ON 전송 완료", COLOR_OK)
         else:
             self.det_hold_start = None
             if not self.on_triggered:
-                self.auto_detection_label.config(text="감지: 대기 중", fg=COLOR_TEXT)
-
-    def process_night_mode(self, frame, now):
+                self.set_label(self.auto_detection_label, "감지: 대기 중", COLOR_TEXT)
+
+    def night_scene_changed(self, small):
+        """Return True if the frame differs enough from the last YOLO frame to re-run YOLO"""
+        gray = cv2.cvtColor(cv2.resize(small, DIFF_SIZE, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        ref = self.night_ref_gray
+        # Still re-check regularly so a motionless person keeps resetting the deadline
+        if (ref is None or time.monotonic() - self.night_yolo_tick >= NIGHT_YOLO_MAX_GAP_SEC
+                or cv2.absdiff(gray, ref).mean() >= NIGHT_DIFF_THRESH):
+            if self.yolo_idle():
+                self.night_ref_gray = gray  # Reference is the frame YOLO will see
+            return True
+        return False
+
+    def start_person_trackers(self, frame, persons):
+        """Start trackers on fresh YOLO person boxes"""
+        self.tracked_persons = persons
+        self.person_trackers = []
+        for x1, y1, x2, y2 in persons:
+            tracker = create_tracker()
+            if tracker is None:
+                break
+            tracker.init(frame, (int(x1), int(y1), int(x2 - x1), int(y2 - y1)))
+            self.person_trackers.append(tracker)
+
+    def track_persons(self, frame):
+        """Advance person trackers to this frame and return the boxes"""
+        if self.person_trackers:
+            boxes = []
+            alive = []
+            for tracker in self.person_trackers:
+                ok, (x, y, w, h) = tracker.update(frame)
+                if ok:
+                    boxes.append((x, y, x + w, y + h))
+                    alive.append(tracker)
+            self.person_trackers = alive
+            self.tracked_persons = np.array(boxes, dtype=np.int32).reshape(-1, 4)
+        # Without trackers the last YOLO boxes are held as-is
+        return self.tracked_persons
+
+    def draw_persons(self, frame, persons, scale):
+        """Draw person boxes (detection-frame coordinates) on the full frame"""
+        rectangle, putText, font = cv2.rectangle, cv2.putText, cv2.FONT_HERSHEY_SIMPLEX  # Hoisted out of the loop
+        for x1, y1, x2, y2 in (persons * scale).astype(np.int32).tolist():
+            # Draw green box around person
+            rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 3)
+            # Add label
+            putText(frame, "Person", (x1, y1-10), font, 0.7, (0, 255, 0), 2)
+
+    def process_night_mode(self, frame, small, scale, now):
         """Process night mode: No-person check + motion detection"""
         self.frame_idx += 1
 
@@ -556,18 +1082,18 @@ class IntegratedMonitorApp:
                 print(f"[디버그] 스냅샷 모드 | 프레임: {self.frame_idx} | 워밍업: {self.frame_idx <= WARMUP_FRAMES}")
 
         if self.night_check_active:
-            # Stage 1: YOLO check for no-person
-            results = self.yolo_model.predict(frame, conf=YOLO_CONF, imgsz=YOLO_IMGSZ, verbose=False)
-            r = results[0]
-
-            detected = False
-            if r.boxes is not None and r.boxes.cls is not None and len(r.boxes.cls) > 0:
-                detected = any(r.names.get(int(c), "") == "person" for c in r.boxes.cls)
-
-            if detected:
-                # Reset deadline
-                self.night_no_person_deadline = now + timedelta(minutes=NIGHT_CHECK_MINUTES)
-                self.auto_detection_label.config(text="감지: 사람 있음 (리셋)", fg=COLOR_WARNING)
+            # Stage 1: YOLO check for no-person, gated by a cheap difference detector
+            done = self.collect_yolo()
+            if self.night_scene_changed(small) and self.submit_yolo(small):
+                self.night_yolo_tick = time.monotonic()
+            if done is not None:
+                persons, _ = done
+                self.status_persons = len(persons)
+
+                if self.status_persons > 0:
+                    # Reset deadline
+                    self.night_no_person_deadline = now + timedelta(minutes=NIGHT_CHECK_MINUTES)
+                    self.set_label(self.auto_detection_label, "감지: 사람 있음 (리셋)", COLOR_WARNING)
 
             # Check deadline
             if self.night_no_person_deadline is not None and now >= self.night_no_person_deadline:
@@ -577,44 +1103,38 @@ class IntegratedMonitorApp:
                     print("=" * 50)
                     self.publish_mqtt("OFF")
                     self.off_triggered_once = True
-                    self.auto_detection_label.config(text="감지: OFF 전송 ✓", fg=COLOR_OK)
+                    self.set_label(self.auto_detection_label, "감지: OFF 전송 ✓", COLOR_OK)
                 self.night_check_active = False
                 self.night_no_person_deadline = None
             else:
                 if self.night_no_person_deadline is not None:
                     remain = int((self.night_no_person_deadline - now).total_seconds())
-                    self.auto_detection_label.config(text=f"감지: {remain}초 남음", fg=COLOR_INFO)
+                    self.set_label(self.auto_detection_label, f"감지: {remain}초 남음", COLOR_INFO)
         else:
             # Stage 2: Motion detection
             if self.frame_idx > WARMUP_FRAMES:
-                fg = self.bg.apply(frame)
-                _, thr = cv2.threshold(fg, BINARY_THRESH, 255, cv2.THRESH_BINARY)
-                clean = cv2.morphologyEx(thr, cv2.MORPH_OPEN, self.kernel, iterations=1)
-                contours, _ = cv2.findContours(clean, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+                clean = self.foreground_mask(small)
+                blobs = filter_motion(clean, MOTION_MIN_AREA, scale)
 
-                motion = False
-                motion_areas = []
+                motion = len(blobs) > 0
+                self.status_motion = len(blobs)
+                motion_areas = blobs[:, cv2.CC_STAT_AREA].tolist()
 
                 # Draw motion detection boxes
-                for cnt in contours:
-                    area = cv2.contourArea(cnt)
-                    if area >= MOTION_MIN_AREA:
-                        motion = True
-                        motion_areas.append(int(area))
-                        # Draw blue box around motion
-                        x, y, w, h = cv2.boundingRect(cnt)
-                        cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 0, 0), 2)
-                        cv2.putText(frame, f"{int(area)}", (x, y-5),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 1)
+                rectangle, putText, font = cv2.rectangle, cv2.putText, cv2.FONT_HERSHEY_SIMPLEX
+                for x, y, w, h, area in blobs.tolist():
+                    # Draw blue box around motion
+                    rectangle(frame, (x, y), (x+w, y+h), (255, 0, 0), 2)
+                    putText(frame, f"{area}", (x, y-5), font, 0.5, (255, 0, 0), 1)
 
                 # Update developer panel
                 if self.developer_mode:
                     if motion:
-                        self.dev_motion_label.config(
-                            text=f"모션 감지: {len(motion_areas)}개 영역 (면적: {sum(motion_areas)})",
-                            fg=COLOR_WARNING)
+                        self.set_label(self.dev_motion_label,
+                                       f"모션 감지: {len(motion_areas)}개 영역 (면적: {sum(motion_areas)})",
+                                       COLOR_WARNING)
                     else:
-                        self.dev_motion_label.config(text="모션 감지: 없음", fg=COLOR_TEXT)
+                        self.set_label(self.dev_motion_label, "모션 감지: 없음", COLOR_TEXT)
 
                 if motion:
                     now_tick = time.monotonic()
@@ -622,9 +1142,9 @@ class IntegratedMonitorApp:
                     if can_save:
                         self.save_snapshot(frame, now)
                         self.last_snapshot_tick = now_tick
-                        self.auto_detection_label.config(text="감지: 모션 저장됨", fg=COLOR_OK)
+                        self.set_label(self.auto_detection_label, "감지: 모션 저장됨", COLOR_OK)
                 else:
-                    self.auto_detection_label.config(text="감지: 모션 대기", fg=COLOR_TEXT)
+                    self.set_label(self.auto_detection_label, "감지: 모션 대기", COLOR_TEXT)
 
     def update_stirfry_camera(self):
         """Update stir-fry camera preview"""
@@ -635,9 +1155,9 @@ class IntegratedMonitorApp:
             self.root.after(100, self.update_stirfry_camera)
             return
 
-        ok, frame = self.stirfry_cap.read()
-        if not ok or frame is None:
-            self.root.after(100, self.update_stirfry_camera)
+        ok, frame = self.stirfry_capture.read()
+        if not ok:
+            self.root.after(10, self.update_stirfry_camera)  # No new frame yet
             return
 
         # If recording, save frames
@@ -651,33 +1171,21 @@ class IntegratedMonitorApp:
 
     def update_auto_preview(self, frame):
         """Update auto system preview"""
-        try:
-            # Resize for preview (larger - more space now)
-            preview = cv2.resize(frame, (560, 420))
-            preview_rgb = cv2.cvtColor(preview, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(preview_rgb)
-            imgtk = ImageTk.PhotoImage(image=img)
-            self.auto_preview_label.imgtk = imgtk
-            self.auto_preview_label.configure(image=imgtk, text="")
-        except Exception as e:
-            pass
+        self.auto_preview.show(frame)
 
     def update_stirfry_preview(self, frame):
         """Update stir-fry camera preview"""
-        try:
-            # Resize for preview (larger - more space now)
-            preview = cv2.resize(frame, (560, 420))
-            preview_rgb = cv2.cvtColor(preview, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(preview_rgb)
-            imgtk = ImageTk.PhotoImage(image=img)
-            self.stirfry_preview_label.imgtk = imgtk
-            self.stirfry_preview_label.configure(image=imgtk, text="")
-        except Exception as e:
-            pass
+        self.stirfry_preview.show(frame)
 
     # =========================
     # Helper Functions
     # =========================
+    def set_label(self, label, text, fg):
+        """Reconfigure a label only when its text or colour actually changes"""
+        if getattr(label, 'shown', None) != (text, fg):
+            label.config(text=text, fg=fg)
+            label.shown = (text, fg)
+
     def is_daytime_mode(self, now):
         """Check if current time is daytime"""
         if FORCE_MODE == "day":
@@ -685,31 +1193,159 @@ class IntegratedMonitorApp:
         if FORCE_MODE == "night":
             return False
 
+        # Reuse the cached mode until the next schedule boundary
+        tick = time.monotonic()
+        if tick < self.mode_valid_until:
+            return self.cached_daytime
+
         today_start = now.replace(hour=DAY_START.hour, minute=DAY_START.minute, second=0, microsecond=0)
         today_end = now.replace(hour=DAY_END.hour, minute=DAY_END.minute, second=0, microsecond=0)
-        return today_start <= now <= today_end
+        daytime = today_start <= now <= today_end
+
+        if now < today_start:
+            next_change = today_start
+        elif daytime:
+            next_change = today_end + timedelta(microseconds=1)
+        else:
+            next_change = today_start + timedelta(days=1)
+        # Re-check at least every minute in case the wall clock is adjusted (NTP)
+        self.mode_valid_until = tick + min((next_change - now).total_seconds(), 60.0)
+        self.cached_daytime = daytime
+        return daytime
+
+    def mog2_learning_rate(self):
+        """Learning rate for this frame: update the model only every Nth frame"""
+        if MOG2_UPDATE_EVERY_N == 1:
+            return -1  # Automatic rate (1 / history)
+        if self.frame_idx % MOG2_UPDATE_EVERY_N:
+            return 0  # Read-only model use
+        # Scale the rate so the model adapts as fast as updating every frame
+        return min(1.0, MOG2_UPDATE_EVERY_N / MOG2_HISTORY)
+
+    def foreground_mask(self, small):
+        """Apply MOG2, binary threshold and opening, returning the mask on the host"""
+        lr = self.mog2_learning_rate()
+        if self.use_cuda:
+            stream = self.cuda_stream
+            fg = self.bg.apply(self.gpu_detect, lr, stream)  # Already on the GPU from downscale()
+            _, thr = cv2.cuda.threshold(fg, BINARY_THRESH, 255, cv2.THRESH_BINARY, stream=stream)
+            clean = self.gpu_open.apply(thr, stream=stream)
+            mask = clean.download(stream)  # Only the final mask leaves the GPU
+            stream.waitForCompletion()
+            return mask
+
+        fg = self.bg.apply(small, learningRate=lr)
+        _, thr = cv2.threshold(fg, BINARY_THRESH, 255, cv2.THRESH_BINARY)
+        return cv2.morphologyEx(thr, cv2.MORPH_OPEN, self.kernel, iterations=1)
+
+    def downscale(self, frame):
+        """Shrink the frame so its long side is YOLO_IMGSZ, return (small, scale back to frame)"""
+        h, w = frame.shape[:2]
+        ratio = min(1.0, YOLO_IMGSZ / max(h, w))
+        size = (int(round(w * ratio)), int(round(h * ratio)))
+
+        if self.use_cuda:
+            # Resize on the GPU and keep the result there for MOG2
+            stream = self.cuda_stream
+            self.gpu_frame.upload(frame, stream)
+            if ratio < 1.0:
+                self.gpu_small = cv2.cuda.resize(self.gpu_frame, size, dst=self.gpu_small,
+                                                 interpolation=cv2.INTER_LINEAR, stream=stream)
+                self.gpu_detect = self.gpu_small
+            else:
+                self.gpu_detect = self.gpu_frame
+            small = self.gpu_detect.download(stream)
+            stream.waitForCompletion()
+        elif ratio < 1.0:
+            small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        else:
+            small = frame
+        return small, w / size[0]
+
+    def yolo_idle(self):
+        """Return True if some engine can take a frame"""
+        return len(self.yolo_pending) < len(self.yolo_engines)
+
+    def submit_yolo(self, frame):
+        """Queue a frame on the next idle engine (round-robin), return True if queued"""
+        n = len(self.yolo_engines)
+        for i in range(n):
+            engine = self.yolo_engines[(self.yolo_next + i) % n]
+            if engine.future is None:
+                engine.submit(frame)
+                self.yolo_pending.append(engine)
+                self.yolo_next = (self.yolo_next + i + 1) % n
+                return True
+        return False
+
+    def collect_yolo(self):
+        """Return (persons, source frame) of the oldest finished inference without blocking"""
+        if not self.yolo_pending or not self.yolo_pending[0].future.done():
+            return None  # Results are taken in submission order
+        engine = self.yolo_pending.popleft()
+        future, engine.future = engine.future, None
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"[YOLO] 추론 오류 ({engine.name}): {e}")
+            return None
+
+    def yolo_interval(self):
+        """Frames between day-mode YOLO runs: configured, or matched to inference latency"""
+        if YOLO_INFER_INTERVAL > 0:
+            return YOLO_INFER_INTERVAL
+        # Engines run in parallel, so the achievable rate scales with their count
+        ewma = sum(e.ewma for e in self.yolo_engines) / len(self.yolo_engines) ** 2
+        return max(1, int(ewma / FRAME_BUDGET_SEC))
 
     def publish_mqtt(self, message):
-        """Publish message to MQTT broker"""
-        if self.mqtt_client is not None:
+        """Queue a control message (ON/OFF) for the MQTT publisher thread"""
+        if self.mqtt_thread is not None:
+            self.mqtt_queue.put((MQTT_TOPIC, message, MQTT_QOS))
+
+    def mqtt_publisher_loop(self):
+        """Publisher thread: drain queued messages off the Tk thread"""
+        while True:
+            item = self.mqtt_queue.get()
+            if item is None:
+                break
+            topic, payload, qos = item
+            control = topic == MQTT_TOPIC
             try:
-                result = self.mqtt_client.publish(MQTT_TOPIC, message, qos=MQTT_QOS)
-                if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                    print(f"[MQTT] 메시지 전송 완료: {message}")
-                else:
+                result = self.mqtt_client.publish(topic, payload, qos=qos)
+                if result.rc != mqtt.MQTT_ERR_SUCCESS:
                     print(f"[MQTT] 전송 실패 (코드 {result.rc})")
+                elif control:
+                    print(f"[MQTT] 메시지 전송 완료: {payload}")
             except Exception as e:
                 print(f"[MQTT] 전송 오류: {e}")
 
+    def publish_status(self):
+        """Publish a batched status beat (QoS 0) once per second"""
+        if not self.running:
+            return
+
+        # Skip the beat while earlier messages are still queued (broker slow or down)
+        if MQTT_STATUS_TOPIC and self.mqtt_thread is not None and self.mqtt_queue.empty():
+            payload = json.dumps({
+                "ts": round(time.time(), 3),
+                "mode": "day" if self.prev_daytime else "night",
+                "person": self.status_persons,
+                "motion": self.status_motion,
+                "stirfry_recording": self.stirfry_recording,
+            })
+            self.mqtt_queue.put_nowait((MQTT_STATUS_TOPIC, payload, 0))
+
+        self.root.after(1000, self.publish_status)
+
     def save_snapshot(self, frame, timestamp):
         """Save motion snapshot"""
         try:
             day_dir = timestamp.strftime("%Y%m%d")
             ts_name = timestamp.strftime("%H%M%S")
-            out_dir = os.path.join(SNAPSHOT_DIR, day_dir)
-            os.makedirs(out_dir, exist_ok=True)
-            out_path = os.path.join(out_dir, f"{ts_name}.jpg")
-            cv2.imwrite(out_path, frame)
+            out_path = os.path.join(SNAPSHOT_DIR, day_dir, f"{ts_name}.jpg")
+            if not self.snapshot_writer.put(frame, out_path):
+                return
 
             # Update tracking
             self.snapshot_count += 1
@@ -724,16 +1360,8 @@ class IntegratedMonitorApp:
                 self.dev_last_snapshot_label.config(
                     text=f"마지막 저장: {timestamp.strftime('%H:%M:%S')}")
 
-                # Update preview
-                try:
-                    preview = cv2.resize(frame, (320, 240))
-                    preview_rgb = cv2.cvtColor(preview, cv2.COLOR_BGR2RGB)
-                    img = Image.fromarray(preview_rgb)
-                    imgtk = ImageTk.PhotoImage(image=img)
-                    self.dev_snapshot_preview.imgtk = imgtk
-                    self.dev_snapshot_preview.configure(image=imgtk, text="")
-                except:
-                    pass
+                # Update preview (reused buffers, same path as the camera previews)
+                self.dev_snapshot_surface.show(frame)
 
         except Exception as e:
             print(f"[오류] 스냅샷 저장 실패: {e}")
@@ -744,10 +1372,9 @@ class IntegratedMonitorApp:
             now = datetime.now()
             day_dir = now.strftime("%Y%m%d")
             ts_name = now.strftime("%H%M%S_%f")[:-3]  # Include milliseconds
-            out_dir = os.path.join(STIRFRY_SAVE_DIR, day_dir)
-            os.makedirs(out_dir, exist_ok=True)
-            out_path = os.path.join(out_dir, f"{ts_name}.jpg")
-            cv2.imwrite(out_path, frame)
+            out_path = os.path.join(STIRFRY_SAVE_DIR, day_dir, f"{ts_name}.jpg")
+            if not self.stirfry_writer.put(frame, out_path):
+                return
             self.stirfry_frame_count += 1
             self.stirfry_count_label.config(text=f"저장: {self.stirfry_frame_count}장")
         except Exception as e:
@@ -830,11 +1457,20 @@ class IntegratedMonitorApp:
             print("[종료] 시스템 종료 중...")
             self.running = False
 
-            # Cleanup
+            # Cleanup (stop readers before releasing their cameras)
+            self.auto_capture.stop()
+            self.stirfry_capture.stop()
             if self.auto_cap is not None:
                 self.auto_cap.release()
             if self.stirfry_cap is not None:
                 self.stirfry_cap.release()
+            self.snapshot_writer.close()
+            self.stirfry_writer.close()
+            for engine in self.yolo_engines:
+                engine.shutdown()
+            if self.mqtt_thread is not None:
+                self.mqtt_queue.put(None)
+                self.mqtt_thread.join(timeout=2.0)
             if self.mqtt_client is not None:
                 self.mqtt_client.loop_stop()
                 self.mqtt_client.disconnect()
@@ -24,11 +24,22 @@ echo "5. Installing paho-mqtt (MQTT communication)..."
 pip3 install paho-mqtt
 
 echo "6. Installing Pillow (PIL - image handling for GUI)..."
-pip3 install pillow
+if [ "$(uname -m)" = "x86_64" ]; then
+    # Pillow-SIMD: API-compatible Pillow fork with SSE4/AVX2 convert/resize
+    apt install -y libjpeg-dev zlib1g-dev
+    pip3 uninstall -y pillow
+    CC="cc -mavx2" pip3 install pillow-simd
+else
+    # Pillow-SIMD has no NEON code paths, so keep stock Pillow on ARM (Jetson)
+    pip3 install pillow
+fi
 
 echo "7. Installing opencv-python (if not included with ultralytics)..."
 pip3 install opencv-python
 
+echo "8. Installing orjson (optional, faster config loading)..."
+pip3 install orjson || echo "orjson not available, falling back to json"
+
 echo ""
 echo "=============================================="
 echo "✅ All dependencies installed successfully!"
@@ -49,17 +49,50 @@ class CameraBase:
             print(f"카메라 초기화 실패: {e}")
             return False
     
-    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+    def read_frame(self, out: Optional[np.ndarray] = None) -> Tuple[bool, Optional[np.ndarray]]:
         """
         프레임 읽기
         
+        Args:
+            out: 프레임을 기록할 미리 할당된 버퍼 (선택사항, 크기가 맞으면 재사용)
+        
+        Returns:
+            tuple: (성공 여부, 프레임 데이터)
+        """
+        if not self.is_initialized or not self.cap:
+            return False, None
+        
+        if out is None:
+            ret, frame = self.cap.read()
+        else:
+            ret = self.cap.grab()
+            if ret:
+                ret, frame = self.cap.retrieve(image=out)
+        return ret, frame if ret else None
+    
+    def grab(self) -> bool:
+        """
+        프레임 가져오기 (디코딩 없음)
+        
+        Returns:
+            bool: 성공 여부
+        """
+        if not self.is_initialized or not self.cap:
+            return False
+        
+        return self.cap.grab()
+    
+    def retrieve(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        마지막으로 grab한 프레임 디코딩
+        
         Returns:
             tuple: (성공 여부, 프레임 데이터)
         """
         if not self.is_initialized or not self.cap:
             return False, None
         
-        ret, frame = self.cap.read()
+        ret, frame = self.cap.retrieve()
         return ret, frame if ret else None
     
     def release(self) -> None:
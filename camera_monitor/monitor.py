@@ -50,7 +50,7 @@ class CameraMonitor:
         """
         # 컴포넌트 초기화
         self.camera = CameraBase(camera_index, resolution)
-        self.recorder = MediaRecorder(self.camera)
+        self.recorder = MediaRecorder(self.camera, ring_size=8)  # 인코딩은 별도 스레드
         self.motion_detector = MotionDetector()
         
         # 상태 변수
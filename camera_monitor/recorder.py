@@ -6,6 +6,7 @@
 import cv2
 import os
 import datetime
+import threading
 import numpy as np
 from typing import Optional
 from camera_monitor.camera_base import CameraBase
@@ -20,12 +21,43 @@ def create_directories(*dirs) -> None:
         os.makedirs(directory, exist_ok=True)
 
 
+def open_h264_writer(filepath: str, fps: int, resolution: tuple) -> cv2.VideoWriter:
+    """
+    Jetson NVENC(nvv4l2h264enc) GStreamer 파이프라인으로 H.264 MP4 기록
+    (사용 불가 시 소프트웨어 mp4v로 대체)
+    """
+    width, height = resolution
+    pipeline = (
+        f"appsrc ! video/x-raw,format=BGR,width={width},height={height},framerate={fps}/1 ! "
+        f"videoconvert ! video/x-raw,format=BGRx ! "
+        f"nvvidconv ! video/x-raw(memory:NVMM),format=NV12 ! "
+        f"nvv4l2h264enc insert-sps-pps=1 bitrate=8000000 preset-level=1 ! "
+        f"h264parse ! mp4mux ! filesink location=\"{filepath}\""
+    )
+    writer = cv2.VideoWriter(pipeline, cv2.CAP_GSTREAMER, 0, fps, resolution, True)
+    if writer.isOpened():
+        print("하드웨어 H.264 인코더 사용 (nvv4l2h264enc)")
+        return writer
+
+    print("하드웨어 H.264 인코더 사용 불가 - mp4v로 대체")
+    return cv2.VideoWriter(filepath, cv2.VideoWriter_fourcc(*'mp4v'), fps, resolution)
+
+
+def open_video_writer(filepath: str, codec: str, fps: int,
+                      resolution: tuple) -> cv2.VideoWriter:
+    """코덱에 맞는 VideoWriter 생성 ('H264'는 하드웨어 인코더)"""
+    if codec.upper() == 'H264':
+        return open_h264_writer(filepath, fps, resolution)
+    return cv2.VideoWriter(filepath, cv2.VideoWriter_fourcc(*codec), fps, resolution)
+
+
 class MediaRecorder:
     """비디오 녹화 및 스크린샷 관리 클래스"""
     
     def __init__(self, camera: CameraBase, 
                  recording_dir: str = "recordings",
-                 screenshot_dir: str = "screenshots"):
+                 screenshot_dir: str = "screenshots",
+                 ring_size: int = 0):
         """
         미디어 레코더 초기화
         
@@ -33,6 +65,8 @@ class MediaRecorder:
             camera: 카메라 객체
             recording_dir: 녹화 파일 저장 디렉토리
             screenshot_dir: 스크린샷 저장 디렉토리
+            ring_size: 0보다 크면 미리 할당한 링 버퍼 + 인코더 스레드로 기록
+                       (write_frame은 링에 복사만 하고 바로 반환)
         """
         self.camera = camera
         self.recording_dir = recording_dir
@@ -43,6 +77,15 @@ class MediaRecorder:
         self.is_recording = False
         self.current_filename = ""
         
+        # 링 버퍼 인코딩 (head: 다음 쓰기 위치, tail: 다음 인코딩 위치)
+        self.ring_size = ring_size
+        self._ring: Optional[np.ndarray] = None
+        self._head = 0
+        self._tail = 0
+        self._ring_cond = threading.Condition()
+        self._encoding = False
+        self._encoder_thread: Optional[threading.Thread] = None
+        
         # 디렉토리 생성
         create_directories(self.recording_dir, self.screenshot_dir)
     
@@ -53,7 +96,7 @@ class MediaRecorder:
         
         Args:
             filename: 파일명 (없으면 자동 생성)
-            codec: 비디오 코덱
+            codec: 비디오 코덱 ('H264'는 Jetson 하드웨어 인코더 사용, .mp4)
             
         Returns:
             bool: 녹화 시작 성공 여부
@@ -69,44 +112,97 @@ class MediaRecorder:
         # 파일명 생성
         if not filename:
             timestamp = get_timestamp()
-            filename = f"recording_{timestamp}.avi"
+            ext = "mp4" if codec.upper() == 'H264' else "avi"
+            filename = f"recording_{timestamp}.{ext}"
         
         self.current_filename = os.path.join(self.recording_dir, filename)
         
         # 비디오 설정
-        fourcc = cv2.VideoWriter_fourcc(*codec)
         fps = fps or 30  # ← camera.fps 대신 30 고정
         
         # 실제 카메라 해상도 가져오기
-        if self.camera.is_initialized:
-            info = self.camera.get_info()
-            resolution = (info['width'], info['height'])  # ← 실제 해상도 사용
-        else:
-            resolution = self.camera.resolution
-        # VideoWriter 생성
-        fourcc = cv2.VideoWriter_fourcc(*codec)
-        fps = self.camera.fps
-        resolution = self.camera.resolution
+        info = self.camera.get_info()
+        resolution = (info['width'], info['height'])  # ← 실제 해상도 사용
         
-        self.video_writer = cv2.VideoWriter(
-            self.current_filename, fourcc, fps, resolution
-        )
+        # VideoWriter 생성
+        self.video_writer = open_video_writer(self.current_filename, codec, fps, resolution)
         
         if self.video_writer.isOpened():
             self.is_recording = True
+            if self.ring_size > 0:
+                self._start_encoder(resolution)
             print(f"녹화 시작: {self.current_filename}")
             return True
         else:
             print("녹화 시작 실패")
             return False
     
+    def _start_encoder(self, resolution: tuple) -> None:
+        """링 버퍼 할당 (크기가 같으면 재사용) 후 인코더 스레드 시작"""
+        width, height = resolution
+        shape = (self.ring_size, height, width, 3)
+        if self._ring is None or self._ring.shape != shape:
+            self._ring = np.empty(shape, dtype=np.uint8)
+        self._head = self._tail = 0
+        self._encoding = True
+        self._encoder_thread = threading.Thread(target=self._encode_loop,
+                                                name="recorder-encoder", daemon=True)
+        self._encoder_thread.start()
+    
+    def _stop_encoder(self) -> None:
+        """남은 프레임을 모두 기록한 뒤 인코더 스레드 종료"""
+        with self._ring_cond:
+            self._encoding = False
+            self._ring_cond.notify_all()
+        self._encoder_thread.join()
+        self._encoder_thread = None
+    
+    def _encode_loop(self) -> None:
+        """링 버퍼의 프레임을 순서대로 VideoWriter에 기록"""
+        cond = self._ring_cond
+        while True:
+            with cond:
+                cond.wait_for(lambda: self._tail < self._head or not self._encoding)
+                if self._tail == self._head:
+                    return
+                slot = self._tail % self.ring_size
+            
+            try:
+                self.video_writer.write(self._ring[slot])
+            except Exception as e:
+                # 인코더가 멈추면 write_frame이 링 대기에서 깨어나도록 알림
+                print(f"프레임 인코딩 실패: {e}")
+                with cond:
+                    self._encoding = False
+                    cond.notify_all()
+                return
+            
+            with cond:
+                self._tail += 1
+                cond.notify_all()
+    
     def write_frame(self, frame: np.ndarray) -> bool:
-        """프레임을 비디오 파일에 기록"""
+        """프레임을 비디오 파일에 기록 (링 버퍼 사용 시 복사 후 바로 반환)"""
         if not self.is_recording or not self.video_writer:
             return False
         
         try:
-            self.video_writer.write(frame)
+            if self._encoder_thread is None:
+                self.video_writer.write(frame)
+                return True
+            
+            # 링이 가득 차면 인코더가 따라올 때까지 대기 (프레임 누락 없음)
+            cond = self._ring_cond
+            with cond:
+                cond.wait_for(lambda: self._head - self._tail < self.ring_size
+                              or not self._encoding)
+                if not self._encoding:
+                    return False
+                slot = self._head % self.ring_size
+            self._ring[slot] = frame
+            with cond:
+                self._head += 1
+                cond.notify_all()
             return True
         except Exception as e:
             print(f"프레임 기록 실패: {e}")
@@ -124,6 +220,9 @@ class MediaRecorder:
         
         filename = self.current_filename
         
+        if self._encoder_thread is not None:
+            self._stop_encoder()
+        
         if self.video_writer:
             self.video_writer.release()
             self.video_writer = None
@@ -44,16 +44,37 @@ class SegmentationResult:
     image_path: str
 
 
+# ONNX Runtime TensorRT EP가 읽는 INT8 캘리브레이션 테이블 (trt_cache/ 안)
+CALIBRATION_TABLE = "calibration.flatbuffers"
+
+
+def preprocess_for_model(image: np.ndarray, input_size: Tuple[int, int], out: np.ndarray):
+    """BGR 이미지를 모델 입력(3xHxW, RGB, 0~1 float32)으로 변환해 out에 기록"""
+    resized = cv2.resize(image, input_size, interpolation=cv2.INTER_LINEAR)
+    rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
+    np.multiply(rgb.transpose(2, 0, 1), 1.0 / 255.0, out=out, casting='unsafe')
+
+
 class FoodSegmenter:
     """음식 영역 분할기"""
 
-    def __init__(self, mode: str = "auto"):
+    def __init__(self, mode: str = "auto", model_path: Optional[str] = None):
         """
         Args:
-            mode: "auto" (자동), "brown" (갈색 음식), "light" (밝은 음식)
+            mode: "auto" (자동), "brown" (갈색 음식), "light" (밝은 음식),
+                  "onnx" (GPU 세그멘테이션 모델),
+                  "trt_fp16" / "trt_int8" (TensorRT FP16/INT8 엔진으로 실행)
+            model_path: ONNX 세그멘테이션 모델 경로 (mode="onnx", "trt_*")
         """
         self.mode = mode
 
+        # GPU 세그멘테이션 모델 (ONNX Runtime)
+        self.session = None
+        self.onnx_threshold = 0.5   # 1채널 출력일 때 음식 확률 임계값
+        self.onnx_food_class = 1    # 다채널 출력일 때 음식 클래스 인덱스
+        if mode in ("onnx", "trt_fp16", "trt_int8"):
+            self._load_onnx_model(model_path)
+
         # HSV 임계값 (튀김 음식 - 갈색~황금색 범위)
         # 여러 범위를 사용하여 다양한 색상 포착
         self.food_ranges = {
@@ -71,6 +92,83 @@ class FoodSegmenter:
             }
         }
 
+    def _load_onnx_model(self, model_path: Optional[str]):
+        """ONNX 세그멘테이션 모델 로드 (TensorRT > CUDA > CPU 순서)"""
+        if not model_path or not Path(model_path).exists():
+            print(f"⚠️ 세그멘테이션 모델 없음: {model_path} - HSV 분할 사용")
+            return
+
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            print("⚠️ onnxruntime 설치 필요: pip install onnxruntime-gpu - HSV 분할 사용")
+            return
+
+        # TensorRT 엔진은 모델 옆 trt_cache/에 캐시 (첫 실행에만 빌드)
+        cache_dir = Path(model_path).parent / "trt_cache"
+        trt_options = {
+            "trt_engine_cache_enable": True,
+            "trt_engine_cache_path": str(cache_dir),
+        }
+        if self.mode in ("trt_fp16", "trt_int8"):
+            trt_options["trt_fp16_enable"] = True
+        if self.mode == "trt_int8":
+            if (cache_dir / CALIBRATION_TABLE).exists():
+                trt_options["trt_int8_enable"] = True
+                trt_options["trt_int8_calibration_table_name"] = CALIBRATION_TABLE
+            else:
+                print(f"⚠️ INT8 캘리브레이션 테이블 없음: {cache_dir / CALIBRATION_TABLE} - FP16 사용")
+
+        available = ort.get_available_providers()
+        providers = []
+        if "TensorrtExecutionProvider" in available:
+            providers.append(("TensorrtExecutionProvider", trt_options))
+        providers += [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider")
+                      if p in available]
+        self.session = ort.InferenceSession(model_path, providers=providers)
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        batch, _, height, width = model_input.shape
+        if not isinstance(height, int) or not isinstance(width, int):
+            height, width = 512, 512  # 동적 크기 모델
+        # 배치 차원이 고정(1)이면 segment_batch도 한 장씩 추론
+        self.dynamic_batch = not isinstance(batch, int) or batch != 1
+
+        # 입력 버퍼는 한 번만 할당하고 매 프레임 재사용
+        self.input_size = (width, height)
+        self.input_buffer = np.empty((1, 3, height, width), dtype=np.float32)
+        print(f"✅ 세그멘테이션 모델 로드: {model_path} ({self.session.get_providers()[0]})")
+
+    def _segment_onnx(self, image: np.ndarray) -> np.ndarray:
+        """ONNX 모델로 음식 마스크 추론 (원본 크기, 0/255)"""
+        preprocess_for_model(image, self.input_size, self.input_buffer[0])
+
+        pred = self.session.run(None, {self.input_name: self.input_buffer})[0][0]
+        return self._prediction_to_mask(pred, image.shape)
+
+    def _segment_onnx_batch(self, images: List[np.ndarray]) -> List[np.ndarray]:
+        """여러 이미지를 (N,3,H,W) 배치 한 번으로 추론"""
+        width, height = self.input_size
+        batch = np.empty((len(images), 3, height, width), dtype=np.float32)
+        for i, image in enumerate(images):
+            preprocess_for_model(image, self.input_size, batch[i])
+
+        preds = self.session.run(None, {self.input_name: batch})[0]
+        return [self._prediction_to_mask(pred, image.shape)
+                for pred, image in zip(preds, images)]
+
+    def _prediction_to_mask(self, pred: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+        """모델 출력(CxHxW)을 원본 크기 0/255 마스크로 변환"""
+        if pred.shape[0] == 1:
+            mask = pred[0] > self.onnx_threshold
+        else:
+            mask = pred.argmax(axis=0) == self.onnx_food_class
+
+        mask = mask.astype(np.uint8) * 255
+        return cv2.resize(mask, (shape[1], shape[0]),
+                          interpolation=cv2.INTER_NEAREST)
+
     def segment(self, image: np.ndarray, visualize: bool = False,
                 save_path: Optional[str] = None) -> SegmentationResult:
         """
@@ -87,34 +185,70 @@ class FoodSegmenter:
         if image is None or image.size == 0:
             raise ValueError("Invalid image")
 
-        # HSV 변환
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+        hsv = None
+        if self.session is not None:
+            # GPU 모델 추론
+            food_mask = self._segment_onnx(image)
+        else:
+            # HSV 변환
+            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+
+            # 여러 색상 범위로 마스크 생성
+            masks = []
+            for range_name, range_val in self.food_ranges.items():
+                mask = cv2.inRange(hsv, range_val["lower"], range_val["upper"])
+                masks.append(mask)
 
-        # 여러 색상 범위로 마스크 생성
-        masks = []
-        for range_name, range_val in self.food_ranges.items():
-            mask = cv2.inRange(hsv, range_val["lower"], range_val["upper"])
-            masks.append(mask)
+            # 모든 마스크 합치기
+            food_mask = np.zeros_like(masks[0])
+            for mask in masks:
+                food_mask = cv2.bitwise_or(food_mask, mask)
 
-        # 모든 마스크 합치기
-        food_mask = np.zeros_like(masks[0])
-        for mask in masks:
-            food_mask = cv2.bitwise_or(food_mask, mask)
+            # 노이즈 제거 (morphology)
+            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+            food_mask = cv2.morphologyEx(food_mask, cv2.MORPH_CLOSE, kernel)
+            food_mask = cv2.morphologyEx(food_mask, cv2.MORPH_OPEN, kernel)
 
-        # 노이즈 제거 (morphology)
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        food_mask = cv2.morphologyEx(food_mask, cv2.MORPH_CLOSE, kernel)
-        food_mask = cv2.morphologyEx(food_mask, cv2.MORPH_OPEN, kernel)
+        return self._build_result(image, food_mask, hsv, visualize, save_path)
 
+    def segment_batch(self, images: List[np.ndarray],
+                      save_paths: Optional[List[Optional[str]]] = None) -> List[SegmentationResult]:
+        """
+        여러 이미지 분할 (GPU 모델은 한 번의 배치 추론)
+
+        Args:
+            images: 입력 이미지 목록 (BGR)
+            save_paths: 이미지별 시각화 저장 경로 (None이면 저장 안 함)
+
+        Returns:
+            이미지 순서대로의 분할 결과
+        """
+        save_paths = save_paths or [None] * len(images)
+        if self.session is None or not self.dynamic_batch or len(images) < 2:
+            return [self.segment(image, save_path=path)
+                    for image, path in zip(images, save_paths)]
+
+        for image in images:
+            if image is None or image.size == 0:
+                raise ValueError("Invalid image")
+
+        masks = self._segment_onnx_batch(images)
+        return [self._build_result(image, mask, None, False, path)
+                for image, mask, path in zip(images, masks, save_paths)]
+
+    def _build_result(self, image: np.ndarray, food_mask: np.ndarray,
+                      hsv: Optional[np.ndarray], visualize: bool,
+                      save_path: Optional[str]) -> SegmentationResult:
+        """마스크 후처리 + 특징 추출 + 시각화"""
         # 작은 영역 제거 (연결된 컴포넌트)
         food_mask = self._remove_small_regions(food_mask, min_area=500)
 
         # 색상 특징 추출
-        color_features = self._extract_color_features(image, food_mask)
+        color_features = self._extract_color_features(image, food_mask, hsv)
 
         # 음식 영역 비율
         total_pixels = image.shape[0] * image.shape[1]
-        food_pixels = np.sum(food_mask > 0)
+        food_pixels = cv2.countNonZero(food_mask)
         food_area_ratio = food_pixels / total_pixels
 
         # 시각화
@@ -132,32 +266,18 @@ class FoodSegmenter:
         """작은 영역 제거"""
         num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
 
-        # 배경(0) 제외하고 작은 영역 제거
-        cleaned_mask = np.zeros_like(mask)
-        for i in range(1, num_labels):
-            if stats[i, cv2.CC_STAT_AREA] >= min_area:
-                cleaned_mask[labels == i] = 255
+        # 배경(0) 제외하고 작은 영역 제거: 라벨별 0/255 LUT로 한 번에 매핑
+        lut = np.where(stats[:, cv2.CC_STAT_AREA] >= min_area, 255, 0).astype(np.uint8)
+        lut[0] = 0
 
-        return cleaned_mask
+        return lut[labels]
 
-    def _extract_color_features(self, image: np.ndarray, mask: np.ndarray) -> ColorFeatures:
+    def _extract_color_features(self, image: np.ndarray, mask: np.ndarray,
+                                hsv: Optional[np.ndarray] = None) -> ColorFeatures:
         """색상 특징 추출"""
-        # 마스크 영역만 추출
-        masked_image = cv2.bitwise_and(image, image, mask=mask)
-
-        # HSV 변환
-        hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-        masked_hsv = cv2.bitwise_and(hsv, hsv, mask=mask)
-
-        # LAB 변환 (색 분석에 더 적합)
-        lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-        masked_lab = cv2.bitwise_and(lab, lab, mask=mask)
-
-        # 마스크 영역의 픽셀만 추출
-        food_pixels_hsv = masked_hsv[mask > 0]
-        food_pixels_lab = masked_lab[mask > 0]
+        food_count = cv2.countNonZero(mask)
 
-        if len(food_pixels_hsv) == 0:
+        if food_count == 0:
             # 음식이 감지되지 않은 경우
             return ColorFeatures(
                 mean_hsv=(0, 0, 0),
@@ -170,28 +290,32 @@ class FoodSegmenter:
                 golden_ratio=0
             )
 
-        # HSV 통계
-        mean_hsv = tuple(np.mean(food_pixels_hsv, axis=0).tolist())
-        std_hsv = tuple(np.std(food_pixels_hsv, axis=0).tolist())
+        # HSV / LAB 변환 (LAB는 색 분석에 더 적합)
+        if hsv is None:
+            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+        lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
+
+        # HSV 통계: 마스크 영역 평균/표준편차를 한 번에 계산
+        mean, std = cv2.meanStdDev(hsv, mask=mask)
+        mean_hsv = tuple(mean.ravel().tolist())
+        std_hsv = tuple(std.ravel().tolist())
 
         # LAB 통계
-        mean_lab = tuple(np.mean(food_pixels_lab, axis=0).tolist())
+        mean_lab = tuple(cv2.mean(lab, mask=mask)[:3])
 
         # 색상(Hue) 히스토그램에서 dominant hue
-        hue_hist = cv2.calcHist([masked_hsv], [0], mask, [180], [0, 180])
+        hue_hist = cv2.calcHist([hsv], [0], mask, [180], [0, 180])
         dominant_hue = float(np.argmax(hue_hist))
 
         # 채도와 명도 평균
-        saturation_mean = float(np.mean(food_pixels_hsv[:, 1]))
-        value_mean = float(np.mean(food_pixels_hsv[:, 2]))
+        saturation_mean = mean_hsv[1]
+        value_mean = mean_hsv[2]
 
-        # 갈색 비율 (Hue 5-25, 튀김 익은 정도)
-        brown_pixels = np.sum((food_pixels_hsv[:, 0] >= 5) & (food_pixels_hsv[:, 0] <= 25))
-        brown_ratio = float(brown_pixels / len(food_pixels_hsv))
+        # 갈색 비율 (Hue 5-25, 튀김 익은 정도): 히스토그램 구간 합
+        brown_ratio = float(hue_hist[5:26].sum() / food_count)
 
         # 황금색 비율 (Hue 15-35, 완벽한 튀김)
-        golden_pixels = np.sum((food_pixels_hsv[:, 0] >= 15) & (food_pixels_hsv[:, 0] <= 35))
-        golden_ratio = float(golden_pixels / len(food_pixels_hsv))
+        golden_ratio = float(hue_hist[15:36].sum() / food_count)
 
         return ColorFeatures(
             mean_hsv=mean_hsv,
@@ -446,6 +570,59 @@ def analyze_existing_data(base_dir: str = "frying_dataset"):
             print("❌ Invalid input")
 
 
+def create_int8_calibration(model_path: str, base_dir: str = "frying_dataset",
+                            max_images: int = 200):
+    """
+    수집된 튀김 이미지로 TensorRT INT8 캘리브레이션 테이블 생성
+
+    Args:
+        model_path: ONNX 세그멘테이션 모델 경로
+        base_dir: 데이터셋 디렉토리 (세션별 images/*.jpg)
+        max_images: 캘리브레이션에 사용할 최대 이미지 수
+    """
+    try:
+        import onnxruntime as ort
+        from onnxruntime.quantization import (CalibrationDataReader, CalibrationMethod,
+                                              create_calibrator, write_calibration_table)
+    except ImportError:
+        print("⚠️ onnxruntime 설치 필요: pip install onnxruntime-gpu")
+        return
+
+    image_paths = sorted(Path(base_dir).glob("*/images/*.jpg"))[:max_images]
+    if not image_paths:
+        print(f"❌ No images found in {base_dir}")
+        return
+
+    model_input = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"]).get_inputs()[0]
+    _, _, height, width = model_input.shape
+    if not isinstance(height, int) or not isinstance(width, int):
+        height, width = 512, 512
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self.paths = iter(image_paths)
+
+        def get_next(self):
+            for path in self.paths:
+                image = cv2.imread(str(path))
+                if image is None:
+                    continue
+                blob = np.empty((1, 3, height, width), dtype=np.float32)
+                preprocess_for_model(image, (width, height), blob[0])
+                return {model_input.name: blob}
+            return None
+
+    cache_dir = Path(model_path).parent / "trt_cache"
+    cache_dir.mkdir(exist_ok=True)
+
+    print(f"📐 Calibrating with {len(image_paths)} images...")
+    calibrator = create_calibrator(model_path, augmented_model_path=str(cache_dir / "augmented.onnx"),
+                                   calibrate_method=CalibrationMethod.MinMax)
+    calibrator.collect_data(FrameReader())
+    write_calibration_table(calibrator.compute_data(), dir=str(cache_dir))
+    print(f"✅ Calibration table saved: {cache_dir / CALIBRATION_TABLE}")
+
+
 def test_single_image(image_path: str):
     """단일 이미지 테스트"""
     image = cv2.imread(image_path)
@@ -469,6 +646,9 @@ if __name__ == "__main__":
         if sys.argv[1] == "test" and len(sys.argv) > 2:
             # 단일 이미지 테스트
             test_single_image(sys.argv[2])
+        elif sys.argv[1] == "calibrate" and len(sys.argv) > 2:
+            # INT8 캘리브레이션: calibrate <model.onnx> [dataset_dir]
+            create_int8_calibration(sys.argv[2], *sys.argv[3:4])
         else:
             # 특정 디렉토리 분석
             analyze_existing_data(sys.argv[1])
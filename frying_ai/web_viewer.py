@@ -16,8 +16,35 @@ import time
 from flask import Flask, render_template, Response, jsonify, request
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple, List
 import threading
+import queue
+
+# libjpeg-turbo 기반 인코더 (없으면 OpenCV로 대체)
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+# 빠른 JSON 직렬화 (없으면 Flask jsonify 사용)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Jetson 하드웨어 JPEG 인코더 (GStreamer nvjpegenc)
+try:
+    import gi
+    gi.require_version('Gst', '1.0')
+    from gi.repository import Gst
+except (ImportError, ValueError):
+    Gst = None
+
+# LAN 뷰어용 원본(PPM) 웹소켓 스트림 (flask-sock)
+try:
+    from flask_sock import Sock
+except ImportError:
+    Sock = None
 
 # 상위 디렉토리 경로 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -27,6 +54,36 @@ from frying_ai.food_segmentation import FoodSegmenter
 
 # Flask 앱
 app = Flask(__name__)
+sock = Sock(app) if Sock is not None else None
+
+# 초기 스트림 프레임 간격 (10 FPS, 이후 적응형 조정)
+STREAM_INTERVAL = 0.1
+
+# 적응형 프레임 간격 범위 (30 FPS ~ 5 FPS)
+STREAM_MIN_INTERVAL = 1.0 / 30
+STREAM_MAX_INTERVAL = 1.0 / 5
+STAGE_EMA_ALPHA = 0.1
+
+# 특징 히스토리 링 버퍼 (프레임별 1행)
+FEATURE_NAMES = ('food_area', 'brown_ratio', 'golden_ratio',
+                 'hue_mean', 'saturation_mean', 'value_mean')
+FEATURE_HISTORY = 600
+
+# 정보 패널: 프레임 기준 (10,10)-(400,200), 텍스트 줄 y 좌표
+INFO_FONT = cv2.FONT_HERSHEY_SIMPLEX
+INFO_COLOR = (0, 255, 0)
+INFO_Y = (35, 60, 85, 110, 135, 160)
+PANEL_Y = tuple(y - 10 for y in INFO_Y)  # 패널(텍스트 레이어) 기준
+
+# MJPEG multipart 파트 헤더
+MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+
+# 스트림 최대 가로 해상도 (인코딩 전에 축소)
+STREAM_MAX_WIDTH = 640
+
+# 마스크 오버레이: 0.7 * frame + 0.3 * 초록색
+MASK_ALPHA = 0.7
+MASK_TINT = (0, 255 * (1 - MASK_ALPHA), 0, 0)
 
 # 전역 상태
 class MonitorState:
@@ -34,121 +91,421 @@ class MonitorState:
         self.collector: Optional[FryingDataCollector] = None
         self.segmenter: Optional[FoodSegmenter] = None
         self.is_running = False
-        self.current_frame = None
-        self.current_features = {}
+        self.feat_buf = np.zeros((FEATURE_HISTORY, len(FEATURE_NAMES)), dtype=np.float32)
+        self.feat_idx = 0             # 다음에 쓸 행 (누적)
+        self.features_valid = False   # 마지막 세그멘테이션 성공 여부
         self.session_active = False
         self.session_id = ""
         self.start_time = 0
-        self.frame_lock = threading.Lock()
+        self.last_render_time = 0.0
+
+        # 적응형 프레임 간격 (파이프라인 처리 속도/큐 점유율 기반)
+        self.stream_interval = STREAM_INTERVAL
+        self.stage_ema = {'segment': 0.0, 'render': 0.0}
+        self.idle_streak = 0
+        self.hw_encoder = None
+
+        # 정보 패널 텍스트 캐시 (값이 바뀔 때만 다시 그림)
+        self.text_layer = np.zeros((191, 391, 3), dtype=np.uint8)
+        self.text_mask = np.zeros((191, 391), dtype=np.uint8)
+        self.text_signature = None
+
+        # 캡처 -> 세그멘테이션 -> 인코딩 파이프라인 (최신 항목만 유지)
+        self.frame_queue: queue.Queue = queue.Queue(maxsize=1)
+        self.seg_queue: queue.Queue = queue.Queue(maxsize=1)
+
+        # 인코딩은 한 번, 모든 시청자가 같은 JPEG 공유
+        self.latest_jpeg: Optional[bytes] = None  # multipart 파트 전체
+        self.jpeg_seq = 0
+        self.frame_ready = threading.Condition()
+
+        # 원본 PPM 프레임 (웹소켓 시청자가 있을 때만 생성)
+        self.latest_ppm: Optional[bytes] = None
+        self.raw_viewers = 0
+        self.pipeline_threads = []
+        self.capture_thread: Optional[threading.Thread] = None
+        self.capture_stop = threading.Event()
 
 state = MonitorState()
 
 
-def initialize_system():
+class NvJpegEncoder:
+    """appsrc ! nvvidconv ! nvjpegenc ! appsink 파이프라인 기반 JPEG 인코더"""
+
+    def __init__(self, width: int, height: int, out_size: Tuple[int, int], quality: int = 85):
+        self.width = width
+        self.height = height
+        self.lock = threading.Lock()
+        self.seq = 0  # 입력 버퍼 PTS로 쓰는 프레임 번호 (출력 JPEG과 짝 맞춤)
+        out_width, out_height = out_size
+
+        Gst.init(None)
+        self.pipeline = Gst.parse_launch(
+            f"appsrc name=src is-live=true format=time "
+            f"caps=video/x-raw,format=BGR,width={width},height={height},framerate=0/1 ! "
+            f"videoconvert ! video/x-raw,format=BGRx ! "
+            f"nvvidconv ! video/x-raw(memory:NVMM),format=I420,"
+            f"width={out_width},height={out_height} ! "
+            f"nvjpegenc quality={quality} ! "
+            f"appsink name=sink sync=false max-buffers=1 drop=false"
+        )
+        self.appsrc = self.pipeline.get_by_name('src')
+        self.appsink = self.pipeline.get_by_name('sink')
+        self.pipeline.set_state(Gst.State.PLAYING)
+
+    def encode(self, frame):
+        """BGR 프레임을 JPEG bytes로 인코딩 (크기가 다르면 None)"""
+        h, w = frame.shape[:2]
+        if w != self.width or h != self.height:
+            return None
+
+        with self.lock:
+            # PyGObject는 data 인자를 GLib 메모리로 마샬링하므로 ndarray를 직접
+            # 감싸는 zero-copy 경로가 없음 (new_wrapped_full도 포인터를 살려두지 않음)
+            # -> 연속 복사 한 번은 유지, 변환/리사이즈/JPEG은 그대로 하드웨어에서 처리
+            buf = Gst.Buffer.new_wrapped(frame.tobytes())
+            pts = self.seq * Gst.MSECOND
+            buf.pts = buf.dts = pts
+            self.seq += 1
+            self.appsrc.emit('push-buffer', buf)
+
+            # 이전 호출에서 타임아웃으로 늦게 나온 JPEG은 버리고 이번 프레임 것만 반환
+            # (그대로 두면 이후 모든 프레임이 한 장씩 밀려서 나감)
+            while True:
+                sample = self.appsink.emit('try-pull-sample', Gst.SECOND)
+                if sample is None:
+                    return None
+                out = sample.get_buffer()
+                if out.pts >= pts:
+                    return out.extract_dup(0, out.get_size())
+
+    def close(self):
+        """파이프라인 정지"""
+        self.appsrc.emit('end-of-stream')
+        self.pipeline.set_state(Gst.State.NULL)
+
+
+def stream_size(width: int, height: int) -> Tuple[int, int]:
+    """스트림 해상도 계산 (가로 STREAM_MAX_WIDTH 이하, 비율 유지)"""
+    if width <= STREAM_MAX_WIDTH:
+        return width, height
+    return STREAM_MAX_WIDTH, round(height * STREAM_MAX_WIDTH / width) // 2 * 2
+
+
+def create_hw_encoder(width: int, height: int):
+    """nvjpegenc 사용 가능하면 하드웨어 인코더 생성 (축소는 nvvidconv에서)"""
+    if Gst is None:
+        return None
+    try:
+        Gst.init(None)
+        if Gst.ElementFactory.find('nvjpegenc') is None:
+            return None
+        out_size = stream_size(width, height)
+        encoder = NvJpegEncoder(width, height, out_size)
+        print(f"✅ NVJPEG 하드웨어 인코더 사용 ({width}x{height} -> {out_size[0]}x{out_size[1]})")
+        return encoder
+    except Exception as e:
+        print(f"⚠️ NVJPEG 인코더 초기화 실패, CPU 인코딩 사용: {e}")
+        return None
+
+
+def initialize_system(seg_model: Optional[str] = None, seg_mode: str = "trt_fp16"):
     """시스템 초기화"""
     state.collector = FryingDataCollector(base_dir="frying_dataset", fps=1)
-    state.segmenter = FoodSegmenter(mode="auto")
+    if seg_model:
+        state.segmenter = FoodSegmenter(mode=seg_mode, model_path=seg_model)
+    else:
+        state.segmenter = FoodSegmenter(mode="auto")
 
     if not state.collector.initialize():
         print("❌ 카메라 초기화 실패")
         return False
 
+    info = state.collector.camera.get_info()
+    if info:
+        state.hw_encoder = create_hw_encoder(info['width'], info['height'])
+
+    # 카메라 버퍼가 쌓이지 않도록 초기화 직후부터 계속 읽기
+    state.capture_stop.clear()
+    state.capture_thread = threading.Thread(target=capture_loop, name="capture_loop", daemon=True)
+    state.capture_thread.start()
+
     print("✅ 시스템 초기화 완료")
     return True
 
 
-def generate_annotated_frame():
-    """주석이 달린 프레임 생성"""
+def put_latest(q: queue.Queue, item):
+    """큐가 가득 차 있으면 가장 오래된 항목을 버리고 추가 (단일 생산자 기준)"""
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        q.put_nowait(item)
+
+
+def capture_frame():
+    """목표 간격까지는 grab만 하고 디코딩은 한 번만"""
     if state.collector is None:
         return None
 
-    # 프레임 캡처
-    ret, frame = state.collector.camera.read_frame()
+    camera = state.collector.camera
+    while True:
+        if not camera.grab():
+            return None
+        now = time.monotonic()
+        if now - state.last_render_time >= state.stream_interval:
+            break
+    state.last_render_time = now
+
+    ret, frame = camera.retrieve()
     if not ret or frame is None:
         return None
+    return frame
 
-    # 세그멘테이션 수행
-    try:
-        seg_result = state.segmenter.segment(frame, visualize=False)
 
-        # 마스크 오버레이 (반투명)
-        overlay = frame.copy()
-        overlay[seg_result.food_mask > 0] = [0, 255, 0]  # 초록색
-        frame = cv2.addWeighted(frame, 0.7, overlay, 0.3, 0)
+def render_info_text(info_lines):
+    """정보 패널 텍스트 레이어 다시 그리기 (패널 좌표 기준)"""
+    layer = state.text_layer
+    layer[:] = 0
+
+    # 두 번째 줄(시간)은 매 프레임 직접 그림
+    session, food_area, brown, golden, hue = info_lines
+    cv2.putText(layer, session, (10, PANEL_Y[0]), INFO_FONT, 0.6, INFO_COLOR, 2)
+    cv2.putText(layer, food_area, (10, PANEL_Y[2]), INFO_FONT, 0.6, INFO_COLOR, 2)
+    cv2.putText(layer, brown, (10, PANEL_Y[3]), INFO_FONT, 0.6, INFO_COLOR, 2)
+    cv2.putText(layer, golden, (10, PANEL_Y[4]), INFO_FONT, 0.6, INFO_COLOR, 2)
+    cv2.putText(layer, hue, (10, PANEL_Y[5]), INFO_FONT, 0.6, INFO_COLOR, 2)
+
+    cv2.extractChannel(layer, 1, dst=state.text_mask)
+    state.text_signature = info_lines
+
+
+def latest_features() -> List[float]:
+    """마지막 프레임의 특징값 (FEATURE_NAMES 순서, 없으면 0)"""
+    if not state.features_valid:
+        return [0.0] * len(FEATURE_NAMES)
+    return state.feat_buf[(state.feat_idx - 1) % FEATURE_HISTORY].tolist()
+
+
+def annotate_frame(frame, seg_result):
+    """세그멘테이션 결과와 세션 정보를 프레임에 그리기"""
+    if seg_result is not None:
+        # 마스크 오버레이 (반투명): 마스크 외곽 사각형 안에서만 블렌딩
+        mask = seg_result.food_mask
+        if mask.shape[:2] != frame.shape[:2]:
+            mask = cv2.resize(mask, (frame.shape[1], frame.shape[0]),
+                              interpolation=cv2.INTER_NEAREST)
+        x, y, w, h = cv2.boundingRect(mask)
+        if w > 0 and h > 0:
+            roi = frame[y:y + h, x:x + w]
+            tinted = cv2.convertScaleAbs(roi, alpha=MASK_ALPHA)
+            cv2.add(tinted, MASK_TINT, dst=tinted)
+            cv2.copyTo(tinted, mask[y:y + h, x:x + w], roi)
 
         # 특징 추출
         features = seg_result.color_features
-        state.current_features = {
-            'food_area': seg_result.food_area_ratio,
-            'brown_ratio': features.brown_ratio,
-            'golden_ratio': features.golden_ratio,
-            'hue_mean': features.mean_hsv[0],
-            'saturation_mean': features.saturation_mean,
-            'value_mean': features.value_mean,
-            'elapsed_time': time.time() - state.start_time if state.session_active else 0
-        }
-
-    except Exception as e:
-        print(f"세그멘테이션 오류: {e}")
-        state.current_features = {}
+        state.feat_buf[state.feat_idx % FEATURE_HISTORY] = (
+            seg_result.food_area_ratio,
+            features.brown_ratio,
+            features.golden_ratio,
+            features.mean_hsv[0],
+            features.saturation_mean,
+            features.value_mean
+        )
+        state.feat_idx += 1
+        state.features_valid = True
+    else:
+        state.features_valid = False
 
     # 정보 오버레이
     if state.session_active:
         elapsed = time.time() - state.start_time
 
-        # 배경 (반투명 검은색)
-        cv2.rectangle(frame, (10, 10), (400, 200), (0, 0, 0), -1)
-        overlay_bg = frame.copy()
-        cv2.rectangle(overlay_bg, (10, 10), (400, 200), (0, 0, 0), -1)
-        frame = cv2.addWeighted(frame, 0.7, overlay_bg, 0.3, 0)
-
-        # 텍스트 정보
-        y_offset = 35
-        line_height = 25
-
-        info_lines = [
-            f"Session: {state.session_id}",
-            f"Time: {elapsed:.1f}s ({elapsed/60:.1f}min)",
-            f"Food Area: {state.current_features.get('food_area', 0):.2%}",
-            f"Brown: {state.current_features.get('brown_ratio', 0):.2%}",
-            f"Golden: {state.current_features.get('golden_ratio', 0):.2%}",
-            f"Hue: {state.current_features.get('hue_mean', 0):.1f}deg"
-        ]
-
-        for i, line in enumerate(info_lines):
-            cv2.putText(frame, line, (20, y_offset + i * line_height),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        # 배경 (반투명 검은색): 패널 영역만 어둡게
+        panel = frame[10:201, 10:401]
+        cv2.convertScaleAbs(panel, dst=panel, alpha=0.3)
+
+        # 텍스트 정보: 시간 외의 줄은 캐시된 레이어를 복사
+        food_area, brown, golden, hue = latest_features()[:4]
+        info_lines = (
+            "Session: %s" % state.session_id,
+            "Food Area: %.2f%%" % (food_area * 100),
+            "Brown: %.2f%%" % (brown * 100),
+            "Golden: %.2f%%" % (golden * 100),
+            "Hue: %.1fdeg" % hue
+        )
+        if info_lines != state.text_signature:
+            render_info_text(info_lines)
+        cv2.copyTo(state.text_layer, state.text_mask, panel)
+
+        cv2.putText(frame, "Time: %.1fs (%.1fmin)" % (elapsed, elapsed / 60),
+                   (20, INFO_Y[1]), INFO_FONT, 0.6, INFO_COLOR, 2)
 
     else:
         # 대기 중
         cv2.putText(frame, "Waiting for session...", (20, 40),
-                   cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 255, 255), 2)
+                   INFO_FONT, 1.0, (0, 255, 255), 2)
 
-    with state.frame_lock:
-        state.current_frame = frame.copy()
+    return frame
 
+
+def stream_frame(frame):
+    """스트림 해상도로 축소"""
+    h, w = frame.shape[:2]
+    out_size = stream_size(w, h)
+    if out_size != (w, h):
+        frame = cv2.resize(frame, out_size, interpolation=cv2.INTER_AREA)
     return frame
 
 
-def generate_stream():
-    """MJPEG 스트림 생성"""
-    while state.is_running:
-        frame = generate_annotated_frame()
+def encode_ppm(frame) -> bytes:
+    """BGR 프레임을 PPM(P6, RGB) bytes로 변환"""
+    rgb = cv2.cvtColor(stream_frame(frame), cv2.COLOR_BGR2RGB)
+    h, w = rgb.shape[:2]
+    return b''.join((b'P6\n%d %d\n255\n' % (w, h), rgb.data))
+
+
+def encode_jpeg(frame, quality=85):
+    """BGR 프레임을 JPEG로 인코딩 (bytes 또는 memoryview)"""
+    if state.hw_encoder is not None:
+        jpeg = state.hw_encoder.encode(frame)
+        if jpeg is not None:
+            return jpeg
+
+    # 브라우저 표시 크기에 맞게 축소 후 인코딩
+    frame = stream_frame(frame)
+
+    if simplejpeg is not None:
+        # Releases the GIL while compressing; returns bytes directly
+        return simplejpeg.encode_jpeg(frame, quality=quality, colorspace='BGR',
+                                      colorsubsampling='420')
+
+    ret, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ret:
+        return None
+    return jpeg.data
+
+
+def update_stage_time(stage: str, started: float):
+    """단계별 처리 시간 EMA 갱신"""
+    elapsed = time.monotonic() - started
+    ema = state.stage_ema[stage]
+    state.stage_ema[stage] = elapsed if ema == 0.0 else ema + STAGE_EMA_ALPHA * (elapsed - ema)
+
+
+def adapt_stream_interval(busy: bool):
+    """큐 점유율과 가장 느린 단계 시간으로 캡처 간격 조정 (30~5 FPS)"""
+    interval = state.stream_interval
+    if busy:
+        # 이전 프레임이 아직 처리되지 않음 -> 느리게
+        state.idle_streak = 0
+        interval *= 1.5
+    else:
+        state.idle_streak += 1
+        if state.idle_streak > 2:
+            interval /= 1.5
+
+    # 가장 느린 단계보다 빠르게 캡처해도 버려질 뿐
+    interval = max(interval, max(state.stage_ema.values()))
+    state.stream_interval = min(max(interval, STREAM_MIN_INTERVAL), STREAM_MAX_INTERVAL)
 
+
+def capture_loop():
+    """1단계: 카메라 프레임 캡처 (최신 프레임 하나만 유지)"""
+    while not state.capture_stop.is_set():
+        frame = capture_frame()
         if frame is None:
             time.sleep(0.1)
             continue
+        adapt_stream_interval(state.frame_queue.full())
+        put_latest(state.frame_queue, frame)
+
 
-        # JPEG 인코딩
-        ret, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-        if not ret:
+def segment_loop():
+    """2단계: 세그멘테이션"""
+    while state.is_running:
+        try:
+            frame = state.frame_queue.get(timeout=1.0)
+        except queue.Empty:
             continue
 
-        # MJPEG 프레임 전송
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + jpeg.tobytes() + b'\r\n')
+        started = time.monotonic()
+        try:
+            seg_result = state.segmenter.segment(frame, visualize=False)
+        except Exception as e:
+            print(f"세그멘테이션 오류: {e}")
+            seg_result = None
+        update_stage_time('segment', started)
+
+        put_latest(state.seg_queue, (frame, seg_result))
+
+
+def render_loop():
+    """3단계: 오버레이 + JPEG 인코딩"""
+    while state.is_running:
+        try:
+            frame, seg_result = state.seg_queue.get(timeout=1.0)
+        except queue.Empty:
+            continue
+
+        started = time.monotonic()
+
+        # CPU 인코딩이면 먼저 축소해서 오버레이/인코딩 모두 작은 프레임에서 처리
+        # (하드웨어 인코더는 nvvidconv에서 축소)
+        if state.hw_encoder is None:
+            frame = stream_frame(frame)
+
+        frame = annotate_frame(frame, seg_result)
+        ppm = encode_ppm(frame) if state.raw_viewers > 0 else None
+        jpeg = encode_jpeg(frame)
+        if jpeg is not None:
+            # multipart 파트를 한 번만 조립 (JPEG 버퍼 복사는 여기서 한 번)
+            part = b''.join((MJPEG_PART_HEADER, jpeg, b'\r\n'))
+            with state.frame_ready:
+                state.latest_jpeg = part
+                state.latest_ppm = ppm
+                state.jpeg_seq += 1
+                state.frame_ready.notify_all()
+
+        update_stage_time('render', started)
+
+
+def start_pipeline():
+    """세그멘테이션/인코딩 스레드 시작 (캡처는 initialize_system에서 시작)"""
+    for target in (segment_loop, render_loop):
+        thread = threading.Thread(target=target, name=target.__name__, daemon=True)
+        thread.start()
+        state.pipeline_threads.append(thread)
+
+
+def stop_pipeline():
+    """파이프라인 스레드 종료 대기"""
+    state.capture_stop.set()
+    if state.capture_thread:
+        state.capture_thread.join(timeout=2.0)
+        state.capture_thread = None
+
+    for thread in state.pipeline_threads:
+        thread.join(timeout=2.0)
+    state.pipeline_threads.clear()
+
+
+def generate_stream():
+    """MJPEG 스트림 생성 (render_loop가 인코딩한 최신 JPEG 전송)"""
+    seen_seq = 0
+    while state.is_running:
+        # 새 프레임이 인코딩될 때까지 대기 (폴링 없음)
+        with state.frame_ready:
+            if not state.frame_ready.wait_for(lambda: state.jpeg_seq != seen_seq, timeout=1.0):
+                continue
+            part = state.latest_jpeg
+            seen_seq = state.jpeg_seq
 
-        time.sleep(0.1)  # 10 FPS
+        # MJPEG 프레임 전송
+        yield part
 
 
 # ==================== 라우트 ====================
@@ -166,15 +523,49 @@ def video_feed():
                    mimetype='multipart/x-mixed-replace; boundary=frame')
 
 
+def ws_feed(ws):
+    """원본 PPM 프레임 웹소켓 스트림 (LAN 전용, ?raw=1)"""
+    with state.frame_ready:
+        state.raw_viewers += 1
+    try:
+        seen_seq = 0
+        while state.is_running:
+            with state.frame_ready:
+                if not state.frame_ready.wait_for(lambda: state.jpeg_seq != seen_seq, timeout=1.0):
+                    continue
+                ppm = state.latest_ppm
+                seen_seq = state.jpeg_seq
+
+            if ppm is not None:
+                ws.send(ppm)
+    finally:
+        with state.frame_ready:
+            state.raw_viewers -= 1
+
+
+if sock is not None:
+    sock.route('/ws_feed')(ws_feed)
+
+
 @app.route('/api/status')
 def get_status():
     """현재 상태 반환"""
-    return jsonify({
+    elapsed = time.time() - state.start_time if state.session_active else 0
+
+    features = {}
+    if state.features_valid:
+        features = dict(zip(FEATURE_NAMES, latest_features()))
+        features['elapsed_time'] = elapsed
+
+    payload = {
         'session_active': state.session_active,
         'session_id': state.session_id,
-        'elapsed_time': time.time() - state.start_time if state.session_active else 0,
-        'features': state.current_features
-    })
+        'elapsed_time': elapsed,
+        'features': features
+    }
+    if orjson is not None:
+        return Response(orjson.dumps(payload), mimetype='application/json')
+    return jsonify(payload)
 
 
 @app.route('/api/start_session', methods=['POST'])
@@ -241,7 +632,8 @@ def get_stats():
     return jsonify(stats)
 
 
-def run_server(host='0.0.0.0', port=5000):
+def run_server(host='0.0.0.0', port=5000, seg_model: Optional[str] = None,
+               seg_mode: str = "trt_fp16"):
     """서버 실행"""
     # 템플릿 디렉토리 생성
     template_dir = Path(__file__).parent / "templates"
@@ -251,11 +643,12 @@ def run_server(host='0.0.0.0', port=5000):
     create_html_template(template_dir)
 
     # 시스템 초기화
-    if not initialize_system():
+    if not initialize_system(seg_model, seg_mode):
         print("❌ 초기화 실패")
         return
 
     state.is_running = True
+    start_pipeline()
 
     print("\n" + "=" * 60)
     print("🌐 튀김 모니터링 웹 뷰어 시작")
@@ -273,6 +666,9 @@ def run_server(host='0.0.0.0', port=5000):
         print("\n종료 중...")
     finally:
         state.is_running = False
+        stop_pipeline()
+        if state.hw_encoder:
+            state.hw_encoder.close()
         if state.collector:
             state.collector.cleanup()
 
@@ -341,7 +737,7 @@ def create_html_template(template_dir: Path):
             overflow: hidden;
         }
 
-        .video-container img {
+        .video-container img, .video-container canvas {
             width: 100%;
             height: auto;
             display: block;
@@ -607,6 +1003,54 @@ def create_html_template(template_dir: Path):
     <script>
         let sessionActive = false;
 
+        // LAN 전용: ?raw=1 이면 JPEG 대신 원본 PPM 웹소켓 스트림 사용
+        if (new URLSearchParams(location.search).get('raw') === '1') {
+            startRawFeed();
+        }
+
+        function startRawFeed() {
+            const img = document.querySelector('.video-container img');
+            const canvas = document.createElement('canvas');
+            img.replaceWith(canvas);
+            const ctx = canvas.getContext('2d');
+            const decoder = new TextDecoder();
+
+            const scheme = location.protocol === 'https:' ? 'wss://' : 'ws://';
+            const ws = new WebSocket(scheme + location.host + '/ws_feed');
+            ws.binaryType = 'arraybuffer';
+
+            ws.onmessage = (msg) => {
+                const data = new Uint8Array(msg.data);
+
+                // 헤더 파싱: "P6 <w> <h> 255" (공백/개행 구분)
+                const fields = [];
+                let pos = 0;
+                while (fields.length < 4) {
+                    const start = pos;
+                    while (data[pos] !== 10 && data[pos] !== 32) pos++;
+                    fields.push(decoder.decode(data.subarray(start, pos)));
+                    pos++;
+                }
+                const width = parseInt(fields[1]);
+                const height = parseInt(fields[2]);
+                if (canvas.width !== width || canvas.height !== height) {
+                    canvas.width = width;
+                    canvas.height = height;
+                }
+
+                // RGB -> RGBA
+                const image = ctx.createImageData(width, height);
+                const rgba = image.data;
+                for (let i = 0, j = pos; i < rgba.length; i += 4, j += 3) {
+                    rgba[i] = data[j];
+                    rgba[i + 1] = data[j + 1];
+                    rgba[i + 2] = data[j + 2];
+                    rgba[i + 3] = 255;
+                }
+                ctx.putImageData(image, 0, 0);
+            };
+        }
+
         // 상태 업데이트 (1초마다)
         setInterval(updateStatus, 1000);
 
@@ -748,4 +1192,9 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         port = int(sys.argv[1])
 
-    run_server(port=port)
+    # 선택: ONNX 세그멘테이션 모델 경로 (GPU 추론)
+    seg_model = sys.argv[2] if len(sys.argv) > 2 else None
+    # 선택: "trt_fp16" (기본), "trt_int8", "onnx" (FP32)
+    seg_mode = sys.argv[3] if len(sys.argv) > 3 else "trt_fp16"
+
+    run_server(port=port, seg_model=seg_model, seg_mode=seg_mode)
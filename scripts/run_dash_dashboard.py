@@ -5,6 +5,7 @@ Run Dash Monitoring Dashboard
 Entry point script to launch the beautiful Dash-based monitoring dashboard.
 
 Usage:
+    pip install -e .   (once, from the project root)
     python scripts/run_dash_dashboard.py
 
     Or make it executable and run directly:
@@ -12,17 +13,7 @@ Usage:
     ./scripts/run_dash_dashboard.py
 """
 
-import sys
-import os
-from pathlib import Path
-
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-sys.path.insert(0, str(project_root / 'src'))
-
-# Import and run main app
-from gui.dash_app import main
-
 if __name__ == '__main__':
+    # Import the app only when actually launching (Dash/Plotly are slow to load)
+    from gui.dash_app import main
     main()
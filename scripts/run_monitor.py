@@ -12,12 +12,19 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import time
 import signal
-import datetime
+import queue
+import threading
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
 from camera_monitor.camera_base import CameraBase
-from camera_monitor.motion_detector import MotionDetector
-from camera_monitor.recorder import MediaRecorder
-from utils import get_timestamp  # ← 추가
+from camera_monitor.motion_detector import MotionDetector, MotionGate
+from camera_monitor.recorder import MediaRecorder, open_video_writer
+from utils import get_timestamp, get_timestamp_cached
 
 # 전역 변수
 is_running = True
@@ -35,27 +42,289 @@ def signal_handler(sig, frame):
     print("\n\n⏸️ 종료 신호 받음... 정리 중...")
     is_running = False
 
+# 로그는 큐에 넣고 별도 리스너 스레드에서 출력 (메인 루프가 stdout에 막히지 않음)
+logger = logging.getLogger("monitor")
+log_listener = None
+
+LOG_LEVELS = {'WARNING': logging.WARNING, 'ERROR': logging.ERROR}
+
+def setup_logging():
+    """QueueHandler + QueueListener 설정 (한 번만)"""
+    global log_listener
+    if log_listener is not None:
+        return
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("[%(stamp)s] [%(tag)s] %(message)s"))
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    log_listener = QueueListener(log_queue, handler)
+    log_listener.start()
+
+def stop_logging():
+    """남은 로그를 모두 출력하고 리스너 정지"""
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+
 def log(message, level="INFO"):
-    """로그 출력"""
-    timestamp = get_timestamp('%Y-%m-%d %H:%M:%S')  # ← 수정
-    print(f"[{timestamp}] [{level}] {message}")
+    """로그 출력 (MOTION/RECORDING 등은 INFO 레벨에 태그만 표시)"""
+    timestamp = get_timestamp_cached('%Y-%m-%d %H:%M:%S')
+    logger.log(LOG_LEVELS.get(level, logging.INFO), message,
+               extra={'stamp': timestamp, 'tag': level})
 
 def print_stats():
     """통계 출력"""
     if stats['start_time']:
-        elapsed = time.time() - stats['start_time']
+        elapsed = time.monotonic() - stats['start_time']
         fps = stats['frames_processed'] / elapsed if elapsed > 0 else 0
         
-        print("\n" + "=" * 60)
-        print("📊 현재 통계")
-        print("=" * 60)
-        print(f"  실행 시간: {elapsed/60:.1f}분 ({elapsed:.0f}초)")
-        print(f"  처리 프레임: {stats['frames_processed']:,}개")
-        print(f"  평균 FPS: {fps:.1f}")
-        print(f"  움직임 감지: {stats['motion_detected']}회")
-        print(f"  스크린샷: {stats['screenshots_saved']}개")
-        print(f"  녹화 세션: {stats['recording_count']}개")
-        print("=" * 60 + "\n")
+        lines = [
+            "",
+            "=" * 60,
+            "📊 현재 통계",
+            "=" * 60,
+            f"  실행 시간: {elapsed/60:.1f}분 ({elapsed:.0f}초)",
+            f"  처리 프레임: {stats['frames_processed']:,}개",
+            f"  평균 FPS: {fps:.1f}",
+            f"  움직임 감지: {stats['motion_detected']}회",
+            f"  스크린샷: {stats['screenshots_saved']}개",
+            f"  녹화 세션: {stats['recording_count']}개",
+            "=" * 60 + "\n",
+        ]
+        # 여러 줄을 한 번에 큐로 보냄
+        log("\n".join(lines), "STATS")
+
+# 감지기/녹화 상태는 매 프레임이 아니라 N 프레임마다 다시 확인
+STATE_POLL_FRAMES = 30
+
+def _skip_frame(frame):
+    return None
+
+def bound_detect(detector, gate=None, stride=1):
+    """
+    현재 상태에 맞는 감지 함수 (비활성이면 아무것도 하지 않음)
+    gate가 있으면 정지 장면을 건너뛰고, stride > 1이면 N 프레임마다 한 번만 감지
+    """
+    if not detector.enabled:
+        return _skip_frame
+    
+    detect = detector.detect
+    if gate is not None:
+        check = gate.check
+        ungated = detect
+        def detect(frame):
+            if check(frame):
+                ungated(frame)
+    if stride <= 1:
+        return detect
+    
+    skip = 0
+    def strided_detect(frame):
+        nonlocal skip
+        if skip:
+            skip -= 1
+            return
+        skip = stride - 1
+        detect(frame)
+    return strided_detect
+
+def read_blocks(camera, frame_interval, probes=5):
+    """read_frame()이 목표 프레임 주기만큼 블로킹되는지 확인"""
+    start = time.monotonic()
+    for _ in range(probes):
+        camera.read_frame()
+    return (time.monotonic() - start) / probes >= frame_interval * 0.5
+
+def put_until_stopped(q, item):
+    """큐가 비워질 때까지 대기하며 put (종료 신호 시 포기)"""
+    while is_running:
+        try:
+            q.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def put_latest(q, item):
+    """가장 오래된 항목을 버리고 최신 항목만 유지 (단일 생산자, 버린 항목 반환)"""
+    try:
+        dropped = q.get_nowait()
+    except queue.Empty:
+        dropped = None
+    q.put_nowait(item)
+    return dropped
+
+class FramePool:
+    """미리 할당한 프레임 버퍼 풀 (참조 카운트가 0이 되면 재사용)"""
+    
+    def __init__(self, shape, size, buffer=None):
+        # buffer(예: SharedMemory.buf)를 주면 그 위에 연속 배치
+        self.shared = buffer is not None
+        if self.shared:
+            nbytes = int(np.prod(shape))
+            self.buffers = [np.ndarray(shape, dtype=np.uint8, buffer=buffer, offset=i * nbytes)
+                            for i in range(size)]
+        else:
+            self.buffers = [np.empty(shape, dtype=np.uint8) for _ in range(size)]
+        self.refs = [0] * size
+        self.lock = threading.Lock()
+        self.free = queue.Queue()
+        for i in range(size):
+            self.free.put(i)
+    
+    def acquire(self, timeout=0.5):
+        """빈 버퍼 인덱스 (모두 사용 중이면 None)"""
+        try:
+            return self.free.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def retain(self, idx, count):
+        """버퍼를 사용할 소비자 수 설정"""
+        with self.lock:
+            self.refs[idx] = count
+    
+    def release(self, idx):
+        """소비자 하나가 버퍼 사용 완료"""
+        with self.lock:
+            self.refs[idx] -= 1
+            done = self.refs[idx] <= 0
+        if done:
+            self.free.put(idx)
+    
+    def store(self, idx, frame):
+        """버퍼가 아닌 곳에 읽힌 프레임 반영 (공유 메모리면 복사)"""
+        if self.shared:
+            np.copyto(self.buffers[idx], frame)
+        else:
+            self.buffers[idx] = frame
+
+def encoder_main(shm_name, shape, size, filepath, codec, fps, index_q, done_q):
+    """인코더 프로세스: 공유 메모리의 프레임을 인덱스로 받아 기록"""
+    # 종료는 메인 프로세스가 None으로 알림 (Ctrl+C 무시)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames = FramePool(shape, size, buffer=shm.buf).buffers
+    writer = open_video_writer(filepath, codec, fps, (shape[1], shape[0]))
+    done_q.put(writer.isOpened())
+    try:
+        while True:
+            idx = index_q.get()
+            if idx is None:
+                break
+            writer.write(frames[idx])
+            done_q.put(idx)
+    finally:
+        writer.release()
+        del frames
+        shm.close()
+        done_q.put(None)
+
+class EncoderProcess:
+    """
+    녹화 인코딩을 별도 프로세스에서 실행 (GIL 분리)
+    프레임은 SharedMemory 풀로 공유하고 큐로는 버퍼 인덱스만 전달
+    """
+    
+    def __init__(self, shape, size, queue_size):
+        self.shape = shape
+        self.size = size
+        self.shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * size)
+        self.pool = FramePool(shape, size, buffer=self.shm.buf)
+        ctx = mp.get_context("spawn")
+        self.ctx = ctx
+        self.index_q = ctx.Queue(maxsize=queue_size)
+        self.done_q = ctx.Queue()
+        self.process = None
+        self.is_recording = False
+    
+    def start_recording(self, filepath, codec, fps=30):
+        """인코더 프로세스 시작 (VideoWriter는 자식 프로세스에서 생성)"""
+        self.process = self.ctx.Process(
+            target=encoder_main, name="encoder", daemon=True,
+            args=(self.shm.name, self.shape, self.size, filepath, codec, fps,
+                  self.index_q, self.done_q))
+        self.process.start()
+        self.is_recording = bool(self.done_q.get())
+        return self.is_recording
+    
+    def close(self):
+        """인코더 종료 후 공유 메모리 해제 (writer 스레드가 끝난 뒤 호출)"""
+        if self.process is not None:
+            self.process.join(timeout=5.0)
+        self.is_recording = False
+        self.pool.buffers = []
+        self.shm.close()
+        self.shm.unlink()
+
+def release_loop(pool, done_q):
+    """인코더 프로세스가 기록을 마친 버퍼 반환 (None을 받으면 종료)"""
+    while True:
+        idx = done_q.get()
+        if idx is None:
+            break
+        pool.release(idx)
+
+def reader_loop(camera, recorder, pool, detect_q, write_q, frame_interval):
+    """1단계: 프레임 읽기 (마감 시각 기준 페이싱)"""
+    next_frame = time.monotonic()
+    recording = recorder.is_recording
+    poll = STATE_POLL_FRAMES
+    while is_running:
+        # 모든 버퍼가 사용 중이면 소비자가 따라올 때까지 대기
+        idx = pool.acquire()
+        if idx is None:
+            continue
+        
+        ret, frame = camera.read_frame(out=pool.buffers[idx])
+        
+        if not ret:
+            pool.free.put(idx)
+            log("프레임 읽기 실패", "WARNING")
+            time.sleep(0.1)
+            continue
+        
+        # 카메라가 버퍼 대신 새 배열을 돌려준 경우
+        if frame is not pool.buffers[idx]:
+            pool.store(idx, frame)
+        
+        # 감지는 항상 최신 프레임만, 녹화는 모든 프레임
+        poll -= 1
+        if not poll:
+            poll = STATE_POLL_FRAMES
+            recording = recorder.is_recording
+        pool.retain(idx, 2 if recording else 1)
+        dropped = put_latest(detect_q, idx)
+        if dropped is not None:
+            pool.release(dropped)
+        if recording and not put_until_stopped(write_q, idx):
+            pool.release(idx)
+        
+        # FPS 제어: 마감 시각 기준 (지연이 누적되지 않음, 초과 시 재동기화)
+        if frame_interval:
+            next_frame += frame_interval
+            delay = next_frame - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_frame = time.monotonic()
+    
+    # 감지 스레드에 종료 알림
+    dropped = put_latest(detect_q, None)
+    if dropped is not None:
+        pool.release(dropped)
+
+def writer_loop(recorder, pool, write_q):
+    """3단계: 녹화 프레임 기록 (None을 받을 때까지 남은 프레임 모두 기록)"""
+    while True:
+        idx = write_q.get()
+        if idx is None:
+            break
+        recorder.write_frame(pool.buffers[idx])
+        pool.release(idx)
 
 def main():
     global is_running
@@ -64,6 +333,8 @@ def main():
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
+    setup_logging()
+    
     print("=" * 60)
     print("🎬 통합 카메라 모니터링 시스템 시작")
     print("=" * 60)
@@ -88,10 +359,17 @@ def main():
     
     if not camera.initialize():
         log("카메라 초기화 실패!", "ERROR")
+        stop_logging()
         return 1
     
     log("✅ 카메라 초기화 성공")
     
+    # 프레임 주기: 카메라 읽기가 이미 블로킹이면 별도 대기 없음
+    frame_interval = 1.0 / config.get('camera.target_fps', 30)
+    if read_blocks(camera, frame_interval):
+        frame_interval = 0
+        log("카메라 읽기가 프레임 주기로 블로킹 → 추가 대기 없음")
+    
     # 3. Recorder 초기화
     log("Recorder 초기화 중...")
     recorder = MediaRecorder(
@@ -100,37 +378,72 @@ def main():
         screenshot_dir=config.get('screenshot.output_dir')
     )
     
+    # 스크린샷 JPEG 인코딩/저장은 백그라운드 스레드에서
+    jpeg_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="screenshot")
+    
     # 4. 움직임 감지기 초기화
     log("움직임 감지기 초기화 중...")
     detector = MotionDetector(
         threshold=config.get('motion_detection.threshold'),
-        min_area=config.get('motion_detection.min_area')
+        min_area=config.get('motion_detection.min_area'),
+        process_width=config.get('motion_detection.process_width', 320)
     )
     
     # 움직임 감지 콜백
     def on_motion(frame):
         stats['motion_detected'] += 1
-        timestamp = get_timestamp('%H:%M:%S')  # ← 수정
         
         # 자동 스크린샷
         if config.get('screenshot.auto_capture_on_motion'):
-            filename = f"motion_{stats['motion_detected']:04d}_{get_timestamp()}.jpg"  # ← 수정
-            recorder.take_screenshot(frame, filename)
+            filename = f"motion_{stats['motion_detected']:04d}_{get_timestamp_cached()}.jpg"
+            # 프레임 버퍼는 재사용되므로 복사본 전달
+            jpeg_pool.submit(recorder.take_screenshot, frame.copy(), filename)
             stats['screenshots_saved'] += 1
             log(f"🚨 움직임 감지 #{stats['motion_detected']} → 스크린샷 저장", "MOTION")
     
     detector.set_callback(on_motion)
     
+    # 정지 장면 사전 필터 (gate_level 0이면 사용 안 함)
+    gate_level = config.get('motion_detection.gate_level', 8)
+    gate = MotionGate(level=gate_level) if gate_level else None
+    
     if config.get('motion_detection.enabled'):
         detector.enable()
         log("✅ 움직임 감지 활성화")
     else:
         log("⏸️ 움직임 감지 비활성화 (config 설정)")
     
+    # 읽기 스레드가 감지(메인 스레드)와 녹화 스레드에 프레임 분배
+    # - 감지: 크기 1 슬롯, 밀리면 오래된 프레임 버림 (항상 실시간)
+    # - 녹화: 제한된 큐로 역압 (프레임 누락 없음)
+    # - 프레임은 미리 할당한 버퍼 풀을 돌려 쓰고 큐에는 버퍼 인덱스만 전달
+    # - recording.encoder_process: 인코딩을 별도 프로세스로 (풀은 SharedMemory)
+    info = camera.get_info()
+    shape = (info['height'], info['width'], 3)
+    detect_q = queue.Queue(maxsize=1)
+    encoder = None
+    if config.get('recording.encoder_process', False):
+        encoder = EncoderProcess(shape, size=8, queue_size=4)
+        pool = encoder.pool
+        write_q = encoder.index_q
+        sink = encoder
+        log("녹화 인코딩: 별도 프로세스 (공유 메모리)")
+    else:
+        write_q = queue.Queue(maxsize=4)
+        pool = FramePool(shape, size=write_q.maxsize + 4)
+        sink = recorder
+    
     # 5. 자동 녹화 시작 여부
     if config.get('recording.auto_start'):
-        filename = f"auto_recording_{get_timestamp()}.avi"  # ← 수정
-        if recorder.start_recording(filename, codec=config.get('recording.codec')):
+        codec = config.get('recording.codec')
+        ext = "mp4" if codec.upper() == 'H264' else "avi"
+        filename = f"auto_recording_{get_timestamp()}.{ext}"  # ← 수정
+        if encoder is not None:
+            started = encoder.start_recording(
+                os.path.join(recorder.recording_dir, filename), codec)
+        else:
+            started = recorder.start_recording(filename, codec=codec)
+        if started:
             stats['recording_count'] += 1
             log(f"🔴 자동 녹화 시작: {filename}", "RECORDING")
     
@@ -138,35 +451,54 @@ def main():
     log("메인 모니터링 루프 시작...")
     log("Ctrl+C로 종료하세요\n")
     
-    stats['start_time'] = time.time()
-    last_stats_time = time.time()
+    stats['start_time'] = time.monotonic()
+    
+    # 통계는 약 30초(목표 FPS 기준 프레임 수)마다 출력 - 매 프레임 시계 확인 없음
+    stats_every = max(1, int(config.get('camera.target_fps', 30) * 30))
+    next_stats_frame = stats_every
+    
+    reader = threading.Thread(target=reader_loop,
+                              args=(camera, sink, pool, detect_q, write_q, frame_interval),
+                              name="reader", daemon=True)
+    if encoder is not None:
+        writer = threading.Thread(target=release_loop, args=(pool, encoder.done_q),
+                                  name="writer", daemon=True)
+    else:
+        writer = threading.Thread(target=writer_loop, args=(recorder, pool, write_q),
+                                  name="writer", daemon=True)
+    reader.start()
+    writer.start()
+    
+    # 녹화 중에는 감지를 N 프레임에 한 번만 (녹화 시작/종료는 poll 주기마다 반영)
+    record_stride = config.get('motion_detection.recording_stride', 5)
+    detect_fn = bound_detect(detector, gate, record_stride if sink.is_recording else 1)
+    poll = STATE_POLL_FRAMES
     
     try:
         while is_running:
-            ret, frame = camera.read_frame()
-            
-            if not ret:
-                log("프레임 읽기 실패", "WARNING")
-                time.sleep(0.1)
+            try:
+                idx = detect_q.get(timeout=0.5)
+            except queue.Empty:
                 continue
+            if idx is None:
+                break
             
             stats['frames_processed'] += 1
             
-            # 움직임 감지
-            if detector.enabled:
-                detector.detect(frame)
+            # 움직임 감지 (감지기 상태는 메인 스레드에서만 사용)
+            detect_fn(pool.buffers[idx])
+            pool.release(idx)
             
-            # 녹화 중이면 프레임 기록
-            if recorder.is_recording:
-                recorder.write_frame(frame)
+            poll -= 1
+            if poll:
+                continue
+            poll = STATE_POLL_FRAMES
+            detect_fn = bound_detect(detector, gate, record_stride if sink.is_recording else 1)
             
-            # 30초마다 통계 출력
-            if time.time() - last_stats_time > 30:
+            # 약 30초마다 통계 출력
+            if stats['frames_processed'] >= next_stats_frame:
                 print_stats()
-                last_stats_time = time.time()
-            
-            # FPS 제어 (약 30fps)
-            time.sleep(0.033)
+                next_stats_frame += stats_every
     
     except Exception as e:
         log(f"오류 발생: {e}", "ERROR")
@@ -177,7 +509,21 @@ def main():
         # 7. 정리
         log("\n정리 작업 중...")
         
-        if recorder.is_recording:
+        # 파이프라인 정지: 읽기 중단 후 남은 녹화 프레임 기록
+        is_running = False
+        reader.join(timeout=2.0)
+        if encoder is not None and encoder.process is None:
+            encoder.done_q.put(None)  # 인코더 미시작: 반환 스레드만 종료
+        else:
+            write_q.put(None)
+        writer.join()
+        jpeg_pool.shutdown(wait=True)
+        
+        if encoder is not None:
+            if encoder.is_recording:
+                log("녹화 중지됨")
+            encoder.close()
+        elif recorder.is_recording:
             recorder.stop_recording()
             log("녹화 중지됨")
         
@@ -188,6 +534,7 @@ def main():
         print_stats()
         
         log("✅ 모니터링 시스템 종료 완료")
+        stop_logging()
     
     return 0
 
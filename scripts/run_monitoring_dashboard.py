@@ -5,6 +5,7 @@ Run Monitoring Dashboard
 Entry point script to launch the centralized monitoring dashboard.
 
 Usage:
+    pip install -e .   (once, from the project root)
     python scripts/run_monitoring_dashboard.py
 
     Or make it executable and run directly:
@@ -13,16 +14,6 @@ Usage:
 """
 
 import sys
-import os
-from pathlib import Path
-
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-sys.path.insert(0, str(project_root / 'src'))
-
-# Import and run main app
-from gui.main_app import main
 
 if __name__ == '__main__':
     print("=" * 60)
@@ -42,6 +33,9 @@ if __name__ == '__main__':
     print("=" * 60)
     print()
 
+    # Import the app after the banner so startup feedback is immediate
+    from gui.main_app import main
+
     try:
         main()
     except KeyboardInterrupt:
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """Visualize frames with most food detected"""
 
+import os
+from multiprocessing import Pool
 from pathlib import Path
 import cv2
-from frying_ai.food_segmentation import FoodSegmenter
 
 # Get frames with most detection (from CSV analysis)
 best_frames = ["t0023", "t0021", "t0022", "t0025", "t0020"]  # Highest food_area_ratio
@@ -11,24 +12,62 @@ best_frames = ["t0023", "t0021", "t0022", "t0025", "t0020"]  # Highest food_area
 session_dir = Path("frying_dataset/potato_20251027_141132")
 images_dir = session_dir / "images"
 output_dir = Path("frying_dataset/analysis_results/visualizations/best_frames")
-output_dir.mkdir(exist_ok=True, parents=True)
 
-segmenter = FoodSegmenter(mode="auto")
+# Segmenter mode: model modes run all frames as one batch in a single worker,
+# HSV mode spreads single frames across CPU workers
+SEG_MODE = "auto"
+MODEL_PATH = None
+MODEL_MODES = ("onnx", "trt_fp16", "trt_int8")
 
-print("Generating visualizations for best frames...\n")
+# Per-process segmenter, created once in each worker
+segmenter = None
 
-for frame_name in best_frames:
-    img_path = images_dir / f"{frame_name}.jpg"
-    if not img_path.exists():
-        continue
 
-    image = cv2.imread(str(img_path))
-    save_path = output_dir / f"vis_{frame_name}.jpg"
+def init_worker():
+    # Imported here so only the workers load the model stack
+    from frying_ai.food_segmentation import FoodSegmenter
 
-    result = segmenter.segment(image, visualize=True, save_path=str(save_path))
+    global segmenter
+    segmenter = FoodSegmenter(mode=SEG_MODE, model_path=MODEL_PATH)
 
-    print(f"✅ {frame_name}: Food area={result.food_area_ratio:.2%}, "
-          f"Brown={result.color_features.brown_ratio:.2%}, "
-          f"Golden={result.color_features.golden_ratio:.2%}")
 
-print(f"\n💾 All visualizations saved to: {output_dir}")
+def render(frame_names):
+    """Segment + visualize a batch of frames; returns [(name, stats), ...]"""
+    names, images = [], []
+    for frame_name in frame_names:
+        img_path = images_dir / f"{frame_name}.jpg"
+        if img_path.exists():
+            names.append(frame_name)
+            images.append(cv2.imread(str(img_path)))
+
+    save_paths = [str(output_dir / f"vis_{name}.jpg") for name in names]
+    results = segmenter.segment_batch(images, save_paths)
+
+    # Only send the numbers back, not the masks
+    return [(name, (result.food_area_ratio,
+                    result.color_features.brown_ratio,
+                    result.color_features.golden_ratio))
+            for name, result in zip(names, results)]
+
+
+if __name__ == "__main__":
+    output_dir.mkdir(exist_ok=True, parents=True)
+
+    print("Generating visualizations for best frames...\n")
+
+    if SEG_MODE in MODEL_MODES:
+        batches = [best_frames]
+    else:
+        batches = [[name] for name in best_frames]
+
+    processes = min(len(batches), os.cpu_count() or 1)
+    with Pool(processes=processes, initializer=init_worker) as pool:
+        results = [item for batch in pool.map(render, batches) for item in batch]
+
+    for frame_name, values in results:
+        food_area, brown, golden = values
+        print(f"✅ {frame_name}: Food area={food_area:.2%}, "
+              f"Brown={brown:.2%}, "
+              f"Golden={golden:.2%}")
+
+    print(f"\n💾 All visualizations saved to: {output_dir}")
@@ -4,6 +4,7 @@
 """
 
 import datetime
+import time
 import pytz
 from typing import Optional
 
@@ -65,6 +66,30 @@ def get_timestamp(format_str: str = "%Y%m%d_%H%M%S") -> str:
     return datetime.datetime.now(tz).strftime(format_str)
 
 
+# 포맷별 (초, 문자열) 캐시
+_stamp_cache = {}
+
+
+def get_timestamp_cached(format_str: str = "%Y%m%d_%H%M%S") -> str:
+    """
+    초 단위로 캐시한 get_timestamp (같은 초 안에서는 다시 포맷하지 않음)
+    초 단위 포맷 전용 - 매 프레임/이벤트마다 호출되는 경로에서 사용
+    
+    Args:
+        format_str: strftime 포맷 문자열
+        
+    Returns:
+        str: 포맷된 시간 문자열
+    """
+    now = int(time.time())
+    cached = _stamp_cache.get(format_str)
+    if cached is None or cached[0] != now:
+        tz = _get_timezone_object()
+        cached = (now, datetime.datetime.fromtimestamp(now, tz).strftime(format_str))
+        _stamp_cache[format_str] = cached
+    return cached[1]
+
+
 def get_datetime() -> datetime.datetime:
     """
     현재 시간을 datetime 객체로 반환 (timezone aware)
@@ -0,0 +1,5 @@
+"""
+GUI Module
+
+Web dashboards (Flask and Dash) for the monitoring system.
+"""
@@ -6,31 +6,40 @@ Beautiful, modern dashboard using Plotly Dash for real-time monitoring
 of all systems: Camera, Vibration, Frying AI, and Work Scheduler.
 """
 
-import sys
 import os
 from pathlib import Path
 
-# Add project root to path
+# Project root (config/ lives here; packages come from `pip install -e .`)
 project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-sys.path.insert(0, str(project_root / 'src'))
 
 import dash
 from dash import dcc, html, Input, Output, State, callback_context
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
+import numpy as np
 import logging
+import importlib
 import json
 import time
-from typing import Dict, Any, Optional, List
-from collections import deque
+import threading
+from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
 from datetime import datetime
-
-# Import monitoring modules
-from monitoring.vibration import VibrationDetector
-from monitoring.camera import CameraBase
-from monitoring.frying import FryingDataCollector
-from scheduler import WorkScheduler, ServiceManager
+from functools import lru_cache
+
+# Monitoring modules are imported on demand in MonitoringSystem.initialize()
+# (camera/frying pull in OpenCV; only enabled subsystems are loaded)
+if TYPE_CHECKING:
+    from monitoring.vibration import VibrationDetector
+    from monitoring.camera import CameraBase
+    from monitoring.frying import FryingDataCollector
+    from scheduler import WorkScheduler
+
+# Faster JSON parsing for the config (falls back to stdlib json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -48,12 +57,15 @@ class DashboardData:
     def __init__(self, max_points: int = 300):
         self.max_points = max_points
 
-        # Vibration data buffers (for live charts)
-        self.vib_time = deque(maxlen=max_points)
-        self.vib_x = deque(maxlen=max_points)
-        self.vib_y = deque(maxlen=max_points)
-        self.vib_z = deque(maxlen=max_points)
-        self.vib_magnitude = deque(maxlen=max_points)
+        # Vibration ring buffer (for live charts): one contiguous float32 row
+        # per series (x, y, z, magnitude) plus a parallel timestamp column
+        self.vib_values = np.zeros((4, max_points), dtype=np.float32)
+        self.vib_time = np.zeros(max_points, dtype='datetime64[ms]')
+        self._head = 0      # next slot to write
+        self._filled = 0    # number of valid samples
+        self.count = 0      # total samples ever written (clients track this)
+        self._last_timestamp = None
+        self._lock = threading.Lock()
 
         # System status
         self.system_status = {
@@ -66,32 +78,110 @@ class DashboardData:
 
     def update_vibration(self, reading):
         """Update vibration data buffers"""
-        if reading:
-            current_time = datetime.fromtimestamp(reading.timestamp)
-            self.vib_time.append(current_time)
-            self.vib_x.append(reading.x_axis)
-            self.vib_y.append(reading.y_axis)
-            self.vib_z.append(reading.z_axis)
-            self.vib_magnitude.append(reading.magnitude)
+        if not reading:
+            return
+        with self._lock:
+            # The status poll returns the latest reading each time; skip repeats
+            if reading.timestamp == self._last_timestamp:
+                return
+            self._last_timestamp = reading.timestamp
+            i = self._head
+            # Local wall-clock time, same as the chart axis showed before
+            self.vib_time[i] = np.datetime64(datetime.fromtimestamp(reading.timestamp), 'ms')
+            self.vib_values[:, i] = (reading.x_axis, reading.y_axis,
+                                     reading.z_axis, reading.magnitude)
+            self._head = (i + 1) % self.max_points
+            self._filled = min(self._filled + 1, self.max_points)
+            self.count += 1
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (times, values) in chronological order; values has shape (4, n).
+        Views into the buffer until it wraps, then one concatenated copy.
+        """
+        if self._filled < self.max_points:
+            n = self._filled
+            return self.vib_time[:n], self.vib_values[:, :n]
+
+        h = self._head
+        if h == 0:
+            return self.vib_time, self.vib_values
+        return (np.concatenate((self.vib_time[h:], self.vib_time[:h])),
+                np.concatenate((self.vib_values[:, h:], self.vib_values[:, :h]), axis=1))
+
+    def samples_since(self, count: int) -> Optional[Tuple[np.ndarray, np.ndarray, int]]:
+        """
+        Copies of the samples written after the given total count, plus the
+        new total (None if nothing new)
+        """
+        with self._lock:
+            if count > self.count:
+                count = 0  # server restarted under an open page
+            n = min(self.count - count, self._filled)
+            if n <= 0:
+                return None
+            times, values = self.snapshot()
+            return times[-n:].copy(), values[:, -n:].copy(), self.count
 
     def update_status(self, status: Dict[str, Any]):
         """Update system status"""
         self.system_status = status
 
-        # Update vibration data if available
-        if status.get('vibration') and status['vibration'].get('latest_reading'):
-            reading_dict = status['vibration']['latest_reading']
 
-            # Create a simple object to hold the data
-            class Reading:
-                def __init__(self, data):
-                    self.timestamp = data['timestamp']
-                    self.x_axis = data['x_axis']
-                    self.y_axis = data['y_axis']
-                    self.z_axis = data['z_axis']
-                    self.magnitude = data['magnitude']
+# Chart traces, in DashboardData.vib_values row order: (name, color, line width)
+VIB_TRACES = [
+    ('X-axis', '#FF6B6B', 2),
+    ('Y-axis', '#4ECDC4', 2),
+    ('Z-axis', '#45B7D1', 2),
+    ('Magnitude', '#FFA07A', 3),
+]
+
+# Most points per trace sent in one update (larger catch-ups are downsampled)
+CHART_MAX_POINTS = 400
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling: indices of n_out points that
+    keep the visual shape of (x, y). First and last points are always kept.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    out = np.empty(n_out, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+
+        # Third triangle vertex: average of the next bucket (or the last point)
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], edges[i + 2])
+            cx, cy = x[nxt].mean(), y[nxt].mean()
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+
+        # Pick the point in this bucket forming the largest triangle
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+
+    return out
+
 
-            self.update_vibration(Reading(reading_dict))
+@lru_cache(maxsize=4)
+def _read_config(config_file: str, mtime: float) -> Dict[str, Any]:
+    """
+    Parse a JSON config file. Cached per (path, mtime), so an edited file is
+    re-read; the returned dict is shared and must be treated as read-only.
+    """
+    with open(config_file, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
 
 
 # Global instances
@@ -101,6 +191,15 @@ monitoring_system = None
 
 # ==================== Monitoring System ====================
 
+def _import_subsystem(module: str, name: str):
+    """Import an optional monitoring subsystem class (None if its dependencies are missing)"""
+    try:
+        return getattr(importlib.import_module(module), name)
+    except ImportError as e:
+        logger.warning(f"{module} unavailable ({e}), skipping")
+        return None
+
+
 class MonitoringSystem:
     """Centralized monitoring system (same as Flask version)"""
 
@@ -108,23 +207,24 @@ class MonitoringSystem:
         self.config_path = config_path
         self.config = self._load_config()
 
+        from scheduler import ServiceManager
         self.service_manager = ServiceManager()
-        self.work_scheduler: Optional[WorkScheduler] = None
-        self.vibration_detector: Optional[VibrationDetector] = None
-        self.camera: Optional[CameraBase] = None
-        self.frying_collector: Optional[FryingDataCollector] = None
+        self.work_scheduler: Optional['WorkScheduler'] = None
+        self.vibration_detector: Optional['VibrationDetector'] = None
+        self.camera: Optional['CameraBase'] = None
+        self.frying_collector: Optional['FryingDataCollector'] = None
 
         self.initialized = False
         self.system_alerts = []
 
     def _load_config(self) -> Dict[str, Any]:
-        """Load system configuration"""
+        """Load system configuration (parsed once per file version)"""
         config_file = os.path.join(project_root, self.config_path)
-        if os.path.exists(config_file):
-            with open(config_file, 'r') as f:
-                return json.load(f)
-        else:
+        try:
+            mtime = os.path.getmtime(config_file)
+        except OSError:
             return self._get_default_config()
+        return _read_config(os.path.abspath(config_file), mtime)
 
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
@@ -183,7 +283,10 @@ class MonitoringSystem:
 
         try:
             # Initialize camera monitoring
+            CameraBase = None
             if self.config.get('camera', {}).get('enabled', True):
+                CameraBase = _import_subsystem('monitoring.camera', 'CameraBase')
+            if CameraBase:
                 cam_config = self.config['camera']
                 resolution = (
                     cam_config['resolution']['width'],
@@ -201,7 +304,10 @@ class MonitoringSystem:
                     logger.warning("Camera initialization failed, but continuing...")
 
             # Initialize vibration monitoring
+            VibrationDetector = None
             if self.config['vibration']['enabled']:
+                VibrationDetector = _import_subsystem('monitoring.vibration', 'VibrationDetector')
+            if VibrationDetector:
                 self.vibration_detector = VibrationDetector(
                     sensor_config=self.config['vibration']['sensor'],
                     analyzer_config=self.config['vibration']['analyzer'],
@@ -214,7 +320,10 @@ class MonitoringSystem:
                     logger.info("Vibration monitoring initialized")
 
             # Initialize frying AI data collector
+            FryingDataCollector = None
             if self.config.get('frying_ai', {}).get('enabled', True):
+                FryingDataCollector = _import_subsystem('monitoring.frying', 'FryingDataCollector')
+            if FryingDataCollector:
                 frying_config = self.config['frying_ai']
                 self.frying_collector = FryingDataCollector(
                     base_dir=frying_config['log_directory'],
@@ -229,6 +338,7 @@ class MonitoringSystem:
 
             # Initialize work scheduler
             if self.config['scheduler']['enabled']:
+                from scheduler import WorkScheduler
                 self.work_scheduler = WorkScheduler(self.config['scheduler'])
                 self.work_scheduler.set_callbacks(
                     start_callback=self._start_all_services,
@@ -272,6 +382,12 @@ class MonitoringSystem:
 
         return status
 
+    def get_latest_vibration(self):
+        """Latest raw vibration reading (cheap; no status aggregation)"""
+        if self.vibration_detector and self.vibration_detector.is_monitoring:
+            return self.vibration_detector.latest_reading
+        return None
+
     def cleanup(self) -> None:
         """Cleanup all resources"""
         logger.info("Cleaning up monitoring system...")
@@ -347,6 +463,34 @@ def create_service_card(service_id: str, service_name: str, icon: str):
     ], className="h-100")
 
 
+def create_vibration_chart():
+    """Create the vibration chart with empty traces (filled by update_chart)"""
+    fig = go.Figure()
+
+    # Add traces for each axis, in DashboardData.vib_values row order
+    for name, color, width in VIB_TRACES:
+        fig.add_trace(go.Scattergl(
+            x=[],
+            y=[],
+            name=name,
+            line=dict(color=color, width=width)
+        ))
+
+    fig.update_layout(
+        title="Vibration Time Series",
+        xaxis_title="Time",
+        yaxis_title="Acceleration (m/s²)",
+        template="plotly_dark",
+        height=300,
+        margin=dict(l=50, r=20, t=40, b=40),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        hovermode='x unified',
+        uirevision='vib'  # keep zoom/pan across updates
+    )
+
+    return fig
+
+
 def create_layout():
     """Create main dashboard layout"""
     return dbc.Container([
@@ -452,7 +596,10 @@ def create_layout():
                         ], className="mb-3"),
 
                         # Live chart
-                        dcc.Graph(id="vibration-chart", config={'displayModeBar': False})
+                        dcc.Graph(id="vibration-chart", figure=create_vibration_chart(),
+                                  config={'displayModeBar': False}),
+                        # Samples this browser already has (see update_chart)
+                        dcc.Store(id='chart-cursor', data=0)
                     ])
                 ], className="mb-3"),
 
@@ -466,8 +613,9 @@ def create_layout():
             ], lg=6)
         ]),
 
-        # Update interval
-        dcc.Interval(id='update-interval', interval=1000, n_intervals=0),  # 1 second
+        # Update intervals: fast chart streaming, slow status/metrics polling
+        dcc.Interval(id='chart-tick', interval=250, n_intervals=0),
+        dcc.Interval(id='status-tick', interval=2000, n_intervals=0),
 
         # Hidden div for storing state
         html.Div(id='hidden-div', style={'display': 'none'})
@@ -482,7 +630,6 @@ app.layout = create_layout()
 
 @app.callback(
     [
-        Output('current-time', 'children'),
         Output('system-status-badge', 'children'),
         Output('system-status-badge', 'color'),
         Output('scheduler-status', 'children'),
@@ -500,26 +647,23 @@ app.layout = create_layout()
         Output('vib-mean', 'children'),
         Output('vib-max', 'children'),
         Output('vib-rms', 'children'),
-        Output('vibration-chart', 'figure'),
         Output('alerts-container', 'children')
     ],
-    Input('update-interval', 'n_intervals')
+    Input('status-tick', 'n_intervals')
 )
 def update_dashboard(n):
-    """Update all dashboard components"""
+    """Update status, scheduler, metric and alert components"""
     global monitoring_system, dashboard_data
 
     if monitoring_system is None:
         # Return default values
         return (
-            datetime.now().strftime("%H:%M:%S"),
             "Initializing", "warning",
             "--", "--", "--", "--", "--",
             "Stopped", "secondary",
             "Stopped", "secondary",
             "Stopped", "secondary",
             "0.00 m/s²", "0.00 m/s²", "0.00 m/s²", "0.00 m/s²",
-            create_empty_chart(),
             html.Div("No alerts", className="text-muted text-center")
         )
 
@@ -527,44 +671,27 @@ def update_dashboard(n):
     status = monitoring_system.get_system_status()
     dashboard_data.update_status(status)
 
-    # Current time
-    current_time = datetime.now().strftime("%H:%M:%S")
-
-    # System status
-    sys_status = "Online" if status['initialized'] else "Offline"
-    sys_color = "success" if status['initialized'] else "danger"
-
-    # Scheduler info
-    scheduler = status.get('scheduler', {})
-    sched_status = "Active" if scheduler.get('scheduler_running') else "Inactive"
-    work_hours = f"{scheduler.get('schedule', {}).get('start', '--')} - {scheduler.get('schedule', {}).get('end', '--')}"
-    is_work = "✅ Yes" if scheduler.get('is_work_time') else "❌ No"
-    auto_mode = "❌ Manual" if scheduler.get('manual_override') else "✅ Auto"
-
-    # Next event
-    next_event = "--"
-    if scheduler.get('minutes_until_start') is not None:
-        mins = scheduler['minutes_until_start']
-        next_event = f"Start in {mins//60}h {mins%60}m"
-    elif scheduler.get('minutes_until_end') is not None:
-        mins = scheduler['minutes_until_end']
-        next_event = f"End in {mins//60}h {mins%60}m"
-
-    # Service statuses
-    services = {s['service_id']: s for s in status.get('services', [])}
-
-    def get_service_status(service_id):
-        s = services.get(service_id, {})
-        status_text = s.get('status', 'stopped').capitalize()
-        color = 'success' if s.get('status') == 'running' else 'secondary'
-        return status_text, color
-
-    cam_text, cam_color = get_service_status('camera')
-    vib_text, vib_color = get_service_status('vibration')
-    fry_text, fry_color = get_service_status('frying')
+    # Status/scheduler/service text only changes on transitions (and once a
+    # minute for the countdown), so format from a hashable key with a cache
+    scheduler = status.get('scheduler') or {}
+    schedule = scheduler.get('schedule') or {}
+    services = {s['service_id']: s.get('status') for s in status.get('services', [])}
+    status_texts = format_status_texts(
+        bool(status['initialized']),
+        (
+            bool(scheduler.get('scheduler_running')),
+            schedule.get('start', '--'),
+            schedule.get('end', '--'),
+            bool(scheduler.get('is_work_time')),
+            bool(scheduler.get('manual_override')),
+            scheduler.get('minutes_until_start'),
+            scheduler.get('minutes_until_end'),
+        ),
+        tuple(services.get(sid) for sid in ('camera', 'vibration', 'frying'))
+    )
 
     # Vibration metrics
-    vib_data = status.get('vibration', {})
+    vib_data = status.get('vibration') or {}
     vib_analysis = vib_data.get('analysis', {})
     vib_stats = vib_data.get('statistics', {})
 
@@ -573,95 +700,96 @@ def update_dashboard(n):
     vib_max = f"{vib_stats.get('max_magnitude', 0):.2f} m/s²"
     vib_rms = f"{vib_stats.get('rms_value', 0):.2f} m/s²"
 
-    # Vibration chart
-    chart = create_vibration_chart()
-
     # Alerts
     alerts = create_alerts_list(status.get('alerts', []))
 
-    return (
-        current_time,
-        sys_status, sys_color,
-        sched_status, work_hours, is_work, auto_mode, next_event,
-        cam_text, cam_color,
-        vib_text, vib_color,
-        fry_text, fry_color,
+    return status_texts + (
         vib_current, vib_mean, vib_max, vib_rms,
-        chart,
         alerts
     )
 
 
-def create_vibration_chart():
-    """Create vibration time-series chart"""
-    global dashboard_data
+@lru_cache(maxsize=64)
+def format_status_texts(initialized: bool, scheduler: tuple, services: tuple) -> tuple:
+    """
+    Format the 12 system/scheduler/service outputs of update_dashboard.
 
-    if len(dashboard_data.vib_time) == 0:
-        return create_empty_chart()
+    scheduler: (running, start, end, is_work_time, manual_override,
+                minutes_until_start, minutes_until_end)
+    services: status strings for camera, vibration, frying (None if missing)
+    """
+    running, start, end, is_work_time, manual_override, until_start, until_end = scheduler
 
-    fig = go.Figure()
+    # System status
+    sys_status = "Online" if initialized else "Offline"
+    sys_color = "success" if initialized else "danger"
 
-    # Add traces for each axis
-    fig.add_trace(go.Scatter(
-        x=list(dashboard_data.vib_time),
-        y=list(dashboard_data.vib_x),
-        name='X-axis',
-        line=dict(color='#FF6B6B', width=2)
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=list(dashboard_data.vib_time),
-        y=list(dashboard_data.vib_y),
-        name='Y-axis',
-        line=dict(color='#4ECDC4', width=2)
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=list(dashboard_data.vib_time),
-        y=list(dashboard_data.vib_z),
-        name='Z-axis',
-        line=dict(color='#45B7D1', width=2)
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=list(dashboard_data.vib_time),
-        y=list(dashboard_data.vib_magnitude),
-        name='Magnitude',
-        line=dict(color='#FFA07A', width=3)
-    ))
+    # Scheduler info
+    sched_status = "Active" if running else "Inactive"
+    work_hours = f"{start} - {end}"
+    is_work = "✅ Yes" if is_work_time else "❌ No"
+    auto_mode = "❌ Manual" if manual_override else "✅ Auto"
 
-    fig.update_layout(
-        title="Vibration Time Series",
-        xaxis_title="Time",
-        yaxis_title="Acceleration (m/s²)",
-        template="plotly_dark",
-        height=300,
-        margin=dict(l=50, r=20, t=40, b=40),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        hovermode='x unified'
-    )
+    # Next event
+    next_event = "--"
+    if until_start is not None:
+        next_event = f"Start in {until_start//60}h {until_start%60}m"
+    elif until_end is not None:
+        next_event = f"End in {until_end//60}h {until_end%60}m"
 
-    return fig
+    # Service statuses
+    service_texts = ()
+    for service_status in services:
+        status_text = (service_status or 'stopped').capitalize()
+        color = 'success' if service_status == 'running' else 'secondary'
+        service_texts += (status_text, color)
 
+    return (sys_status, sys_color,
+            sched_status, work_hours, is_work, auto_mode, next_event) + service_texts
 
-def create_empty_chart():
-    """Create empty chart placeholder"""
-    fig = go.Figure()
-    fig.add_annotation(
-        text="No data available",
-        xref="paper",
-        yref="paper",
-        x=0.5,
-        y=0.5,
-        showarrow=False,
-        font=dict(size=20, color="gray")
-    )
-    fig.update_layout(
-        template="plotly_dark",
-        height=300,
-        margin=dict(l=50, r=20, t=40, b=40)
-    )
-    return fig
+
+@app.callback(
+    [
+        Output('vibration-chart', 'extendData'),
+        Output('chart-cursor', 'data')
+    ],
+    Input('chart-tick', 'n_intervals'),
+    State('chart-cursor', 'data')
+)
+def update_chart(n, cursor):
+    """Append only the samples this browser has not received yet"""
+    if monitoring_system is not None:
+        dashboard_data.update_vibration(monitoring_system.get_latest_vibration())
+
+    new_samples = dashboard_data.samples_since(cursor or 0)
+    if new_samples is None:
+        raise PreventUpdate
+
+    times, values, count = new_samples
+    if len(times) > CHART_MAX_POINTS:
+        # Catch-up after a (re)load or a large max_points: ship a
+        # shape-preserving subset per trace instead of every sample
+        t_ms = times.astype(np.int64).astype(np.float64)
+        xs, ys = [], []
+        for row in values:
+            idx = lttb_indices(t_ms, row, CHART_MAX_POINTS)
+            xs.append(np.datetime_as_string(times[idx]).tolist())
+            ys.append(row[idx].tolist())
+    else:
+        stamps = np.datetime_as_string(times).tolist()
+        xs = [stamps] * len(VIB_TRACES)
+        ys = [row.tolist() for row in values]
+
+    extend = dict(x=xs, y=ys)
+    return (extend, list(range(len(VIB_TRACES))), dashboard_data.max_points), count
+
+
+# Header clock runs in the browser so it can tick without a server round trip
+app.clientside_callback(
+    "function(n) { return new Date().toLocaleTimeString('en-GB'); }",
+    Output('current-time', 'children'),
+    Input('chart-tick', 'n_intervals')
+)
 
 
 def create_alerts_list(alerts: List[Dict[str, Any]]):
@@ -8,14 +8,11 @@ Web-based GUI for monitoring all systems:
 - Work scheduler
 """
 
-import sys
 import os
 from pathlib import Path
 
-# Add parent directories to path
+# Project root (config/ lives here; packages come from `pip install -e .`)
 project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-sys.path.insert(0, str(project_root / 'src'))
 
 from flask import Flask, render_template, jsonify, request, Response
 import logging
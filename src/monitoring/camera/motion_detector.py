@@ -11,18 +11,26 @@ from typing import Optional, Callable, Tuple
 class MotionDetector:
     """움직임 감지 클래스"""
     
-    def __init__(self, threshold: int = 1000, min_area: int = 500):
+    def __init__(self, threshold: int = 1000, min_area: int = 500,
+                 process_width: Optional[int] = None):
         """
         움직임 감지기 초기화
         
         Args:
             threshold: 움직임 감지 임계값 (픽셀 수)
             min_area: 최소 감지 영역 크기
+            process_width: 감지용 축소 그레이스케일 가로 크기 (None이면 원본 사용)
         """
         self.threshold = threshold
         self.min_area = min_area
         self.enabled = False
         
+        # 축소 처리용 버퍼 (첫 프레임 크기에 맞춰 할당 후 재사용)
+        self.process_width = process_width
+        self._small: Optional[np.ndarray] = None
+        self._gray: Optional[np.ndarray] = None
+        self._area_scale = 1.0
+        
         # 배경 차분 객체
         self.background_subtractor = cv2.createBackgroundSubtractorMOG2(
             detectShadows=True, varThreshold=50
@@ -68,13 +76,13 @@ class MotionDetector:
             frame: 입력 프레임
             
         Returns:
-            tuple: (움직임 감지 여부, 움직임 마스크)
+            tuple: (움직임 감지 여부, 움직임 마스크 - 처리 해상도 기준)
         """
         if not self.enabled:
             return False, None
         
-        # 배경 차분 적용
-        fg_mask = self.background_subtractor.apply(frame)
+        # 배경 차분 적용 (process_width 설정 시 축소 그레이스케일에서)
+        fg_mask = self.background_subtractor.apply(self._prepare(frame))
         
         # 노이즈 제거
         fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, self.kernel)
@@ -83,8 +91,8 @@ class MotionDetector:
         # 움직임 픽셀 수 계산
         motion_pixels = cv2.countNonZero(fg_mask)
         
-        # 기본 임계값 검사
-        if motion_pixels < self.threshold:
+        # 기본 임계값 검사 (축소 시 면적 기준도 같은 비율로 축소)
+        if motion_pixels < self.threshold * self._area_scale:
             return False, fg_mask
         
         # 윤곽선 기반 정확한 검증
@@ -93,7 +101,8 @@ class MotionDetector:
         )
         
         # 최소 영역 이상의 윤곽선이 있는지 확인
-        valid_motion = any(cv2.contourArea(contour) > self.min_area 
+        min_area = self.min_area * self._area_scale
+        valid_motion = any(cv2.contourArea(contour) > min_area
                           for contour in contours)
         
         # 움직임 감지 시 콜백 호출
@@ -102,6 +111,23 @@ class MotionDetector:
         
         return valid_motion, fg_mask
     
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        """감지용 프레임 준비 (축소 + 그레이스케일, 버퍼 재사용)"""
+        height, width = frame.shape[:2]
+        if not self.process_width or width <= self.process_width:
+            self._area_scale = 1.0
+            return frame
+        
+        size = (self.process_width, max(1, round(height * self.process_width / width)))
+        if self._small is None or self._small.shape[1::-1] != size:
+            self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._gray = np.empty((size[1], size[0]), dtype=np.uint8)
+        self._area_scale = (size[0] * size[1]) / (width * height)
+        
+        cv2.resize(frame, size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        return self._gray
+    
     def draw_motion_overlay(self, frame: np.ndarray, motion_detected: bool, 
                            mask: Optional[np.ndarray] = None) -> np.ndarray:
         """
@@ -136,9 +162,15 @@ class MotionDetector:
                 contours, _ = cv2.findContours(
                     mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
                 )
-                # 최소 영역 이상의 윤곽선만 그리기
+                # 최소 영역 이상의 윤곽선만 그리기 (마스크는 처리 해상도)
+                min_area = self.min_area * self._area_scale
                 valid_contours = [c for c in contours 
-                                if cv2.contourArea(c) > self.min_area]
+                                if cv2.contourArea(c) > min_area]
+                # 윤곽선 좌표를 원본 프레임 크기로 변환
+                scale = frame.shape[1] / mask.shape[1]
+                if scale != 1:
+                    valid_contours = [(c * scale).astype(np.int32)
+                                      for c in valid_contours]
                 cv2.drawContours(result, valid_contours, -1, (0, 255, 0), 2)
         
         return result
@@ -167,4 +199,66 @@ class MotionDetector:
             'threshold': self.threshold,
             'min_area': self.min_area,
             'has_callback': self.motion_callback is not None
-        }
\ No newline at end of file
+        }
+
+class MotionGate:
+    """
+    정지 장면 사전 필터
+    작은 그레이스케일 프레임 간 차이의 적분 영상으로 격자 블록 합을 구해,
+    모든 블록이 기준 이하면 정지 장면으로 보고 전체 감지를 건너뜀
+    """
+    
+    def __init__(self, width: int = 160, grid: Tuple[int, int] = (5, 4),
+                 level: int = 8):
+        """
+        Args:
+            width: 비교용 축소 가로 크기
+            grid: 블록 격자 (가로, 세로)
+            level: 블록 내 평균 밝기 차이 기준 (0~255)
+        """
+        self.width = width
+        self.grid = grid
+        self.level = level
+        
+        self._small: Optional[np.ndarray] = None
+        self._cur: Optional[np.ndarray] = None
+        self._prev: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None
+        self._ys: Optional[np.ndarray] = None
+        self._xs: Optional[np.ndarray] = None
+        self._block_threshold = 0
+    
+    def check(self, frame: np.ndarray) -> bool:
+        """이전 프레임 대비 변화가 있으면 True (첫 프레임/크기 변경 시 True)"""
+        height, width = frame.shape[:2]
+        small_width = min(self.width, width)
+        size = (small_width, max(1, round(height * small_width / width)))
+        first = self._cur is None or self._cur.shape[::-1] != size
+        if first:
+            self._allocate(size)
+        
+        cv2.resize(frame, size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._cur)
+        if first:
+            self._prev[...] = self._cur
+            return True
+        
+        cv2.absdiff(self._cur, self._prev, dst=self._diff)
+        self._prev, self._cur = self._cur, self._prev
+        
+        # 격자 꼭짓점의 적분값으로 블록 합 계산 (블록당 O(1))
+        ii = cv2.integral(self._diff)
+        c = ii[np.ix_(self._ys, self._xs)]
+        sums = c[1:, 1:] - c[:-1, 1:] - c[1:, :-1] + c[:-1, :-1]
+        return int(sums.max()) > self._block_threshold
+    
+    def _allocate(self, size: Tuple[int, int]) -> None:
+        """축소 크기에 맞춰 버퍼와 격자 좌표 준비"""
+        w, h = size
+        self._small = np.empty((h, w, 3), dtype=np.uint8)
+        self._cur = np.empty((h, w), dtype=np.uint8)
+        self._prev = np.empty((h, w), dtype=np.uint8)
+        self._diff = np.empty((h, w), dtype=np.uint8)
+        self._xs = np.linspace(0, w, self.grid[0] + 1).astype(np.intp)
+        self._ys = np.linspace(0, h, self.grid[1] + 1).astype(np.intp)
+        self._block_threshold = self.level * (w // self.grid[0]) * (h // self.grid[1])
@@ -62,7 +62,9 @@ if ret:
 
 # 5. 비디오 녹화 테스트
 print("\n5️⃣ 3초 비디오 녹화 테스트...")
-if recorder.start_recording("config_test.avi", codec=config.get('recording.codec')):
+codec = config.get('recording.codec')
+ext = "mp4" if codec.upper() == 'H264' else "avi"
+if recorder.start_recording(f"config_test.{ext}", codec=codec):
     for i in range(90):  # 3초
         ret, frame = camera.read_frame()
         if ret: